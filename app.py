@@ -1,654 +1,1574 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-from werkzeug.utils import secure_filename
-from werkzeug.security import generate_password_hash, check_password_hash
-import os
-import sqlite3
-from datetime import datetime
-from functools import wraps
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'litus-secret-key-2024'
-app.config['UPLOAD_FOLDER'] = 'static/uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
-app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-
-# Upload klasörünü oluştur
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-# Veritabanı bağlantısı
-def get_db():
-    conn = sqlite3.connect('database.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
-# Veritabanını başlat
-def init_db():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Categories tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL
-        )
-    ''')
-    
-    # Products tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            price REAL NOT NULL,
-            description TEXT,
-            image TEXT,
-            category_id INTEGER,
-            FOREIGN KEY (category_id) REFERENCES categories(id)
-        )
-    ''')
-    
-    # Comments tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS comments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_id INTEGER NOT NULL,
-            user_id INTEGER,
-            username TEXT NOT NULL,
-            comment TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (product_id) REFERENCES products(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    
-    # Users tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            is_admin INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Cart tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS cart (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            product_id INTEGER NOT NULL,
-            quantity INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (product_id) REFERENCES products(id)
-        )
-    ''')
-    
-    # Favorites tablosu
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS favorites (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            product_id INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (product_id) REFERENCES products(id),
-            UNIQUE(user_id, product_id)
-        )
-    ''')
-    
-    # Admin kullanıcısı oluştur
-    cursor.execute('SELECT COUNT(*) FROM users WHERE username = ?', ('admin',))
-    if cursor.fetchone()[0] == 0:
-        admin_password = generate_password_hash('admin')
-        cursor.execute('INSERT INTO users (username, email, password, is_admin) VALUES (?, ?, ?, ?)',
-                      ('admin', 'admin@litus.com', admin_password, 1))
-    
-    # Veritabanı migration - eksik kolonları ekle
-    try:
-        # Comments tablosuna user_id kolonu ekle (eğer yoksa)
-        cursor.execute("PRAGMA table_info(comments)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'user_id' not in columns:
-            cursor.execute('ALTER TABLE comments ADD COLUMN user_id INTEGER')
-            conn.commit()
-    except Exception as e:
-        print(f"Migration hatası: {e}")
-    
-    # Örnek kategoriler ekle
-    cursor.execute('SELECT COUNT(*) FROM categories')
-    if cursor.fetchone()[0] == 0:
-        categories = ['Kadın', 'Erkek', 'Çocuk', 'Aksesuar', 'Koleksiyon']
-        for cat in categories:
-            cursor.execute('INSERT INTO categories (name) VALUES (?)', (cat,))
-    
-    conn.commit()
-    conn.close()
-
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
-
-# Login required decorator
-def login_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            flash('Bu sayfaya erişmek için giriş yapmalısınız!', 'error')
-            return redirect(url_for('login'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Admin required decorator
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            flash('Bu sayfaya erişmek için giriş yapmalısınız!', 'error')
-            return redirect(url_for('login'))
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT is_admin FROM users WHERE id = ?', (session['user_id'],))
-        user = cursor.fetchone()
-        conn.close()
-        if not user or user['is_admin'] != 1:
-            flash('Bu sayfaya erişim yetkiniz yok!', 'error')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Context processor - tüm template'lere categories ve user bilgisi ekle
-@app.context_processor
-def inject_categories():
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM categories')
-    categories = cursor.fetchall()
-    
-    user = None
-    if 'user_id' in session:
-        cursor.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],))
-        user = cursor.fetchone()
-    
-    conn.close()
-    return dict(categories=categories, current_user=user)
-
-# ==================== AUTH ROUTES ====================
-
-@app.route('/register', methods=['GET', 'POST'])
-def register():
-    if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        email = request.form.get('email', '').strip()
-        password = request.form.get('password', '').strip()
-        confirm_password = request.form.get('confirm_password', '').strip()
-        
-        if not username or not email or not password:
-            flash('Lütfen tüm alanları doldurun!', 'error')
-            return redirect(url_for('register'))
-        
-        if password != confirm_password:
-            flash('Şifreler eşleşmiyor!', 'error')
-            return redirect(url_for('register'))
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # Kullanıcı adı kontrolü
-        cursor.execute('SELECT id FROM users WHERE username = ?', (username,))
-        if cursor.fetchone():
-            flash('Bu kullanıcı adı zaten kullanılıyor!', 'error')
-            conn.close()
-            return redirect(url_for('register'))
-        
-        # Email kontrolü
-        cursor.execute('SELECT id FROM users WHERE email = ?', (email,))
-        if cursor.fetchone():
-            flash('Bu e-posta adresi zaten kullanılıyor!', 'error')
-            conn.close()
-            return redirect(url_for('register'))
-        
-        # Kullanıcı oluştur
-        hashed_password = generate_password_hash(password)
-        cursor.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
-                      (username, email, hashed_password))
-        conn.commit()
-        user_id = cursor.lastrowid
-        conn.close()
-        
-        session['user_id'] = user_id
-        session['username'] = username
-        flash('Kayıt başarılı! Hoş geldiniz!', 'success')
-        return redirect(url_for('index'))
-    
-    return render_template('register.html')
-
-@app.route('/login', methods=['GET', 'POST'])
-def login():
-    if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
-        
-        if not username or not password:
-            flash('Lütfen kullanıcı adı ve şifre girin!', 'error')
-            return redirect(url_for('login'))
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-        user = cursor.fetchone()
-        conn.close()
-        
-        if user and check_password_hash(user['password'], password):
-            session['user_id'] = user['id']
-            session['username'] = user['username']
-            session['is_admin'] = user['is_admin']
-            
-            if user['is_admin'] == 1:
-                flash('Admin paneline hoş geldiniz!', 'success')
-                return redirect(url_for('admin_dashboard'))
-            else:
-                flash('Giriş başarılı! Hoş geldiniz!', 'success')
-                return redirect(url_for('index'))
-        else:
-            flash('Kullanıcı adı veya şifre hatalı!', 'error')
-            return redirect(url_for('login'))
-    
-    return render_template('login.html')
-
-@app.route('/logout')
-def logout():
-    session.clear()
-    flash('Çıkış yapıldı!', 'success')
-    return redirect(url_for('index'))
-
-# ==================== MAIN ROUTES ====================
-
-@app.route('/')
-def index():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Kategorileri al
-    cursor.execute('SELECT * FROM categories')
-    categories = cursor.fetchall()
-    
-    # Öne çıkan ürünler (ilk 8 ürün)
-    cursor.execute('SELECT * FROM products ORDER BY id DESC LIMIT 8')
-    featured_products = cursor.fetchall()
-    
-    conn.close()
-    return render_template('index.html', categories=categories, featured_products=featured_products)
-
-@app.route('/category/<int:category_id>')
-def category(category_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Kategori bilgisi
-    cursor.execute('SELECT * FROM categories WHERE id = ?', (category_id,))
-    category = cursor.fetchone()
-    
-    if not category:
-        flash('Kategori bulunamadı!', 'error')
-        return redirect(url_for('index'))
-    
-    # Kategoriye ait ürünler
-    cursor.execute('SELECT * FROM products WHERE category_id = ?', (category_id,))
-    products = cursor.fetchall()
-    
-    conn.close()
-    return render_template('category.html', category=category, products=products)
-
-@app.route('/product/<int:product_id>')
-def product_detail(product_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Ürün bilgisi
-    cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
-    product = cursor.fetchone()
-    
-    if not product:
-        flash('Ürün bulunamadı!', 'error')
-        return redirect(url_for('index'))
-    
-    # Ürün yorumları
-    # user_id kolonu varsa JOIN yap, yoksa sadece username kullan
-    try:
-        cursor.execute("PRAGMA table_info(comments)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'user_id' in columns:
-            cursor.execute('SELECT c.*, u.username as user_username FROM comments c LEFT JOIN users u ON c.user_id = u.id WHERE c.product_id = ? ORDER BY c.created_at DESC', (product_id,))
-        else:
-            cursor.execute('SELECT * FROM comments WHERE product_id = ? ORDER BY created_at DESC', (product_id,))
-    except Exception as e:
-        # Hata durumunda basit sorgu
-        print(f"Yorum sorgusu hatası: {e}")
-        cursor.execute('SELECT * FROM comments WHERE product_id = ? ORDER BY created_at DESC', (product_id,))
-    comments = cursor.fetchall()
-    
-    # Favori kontrolü
-    is_favorite = False
-    if 'user_id' in session:
-        cursor.execute('SELECT id FROM favorites WHERE user_id = ? AND product_id = ?', 
-                     (session['user_id'], product_id))
-        is_favorite = cursor.fetchone() is not None
-    
-    conn.close()
-    return render_template('product_detail.html', product=product, comments=comments, is_favorite=is_favorite)
-
-@app.route('/product/<int:product_id>/comment', methods=['POST'])
-@login_required
-def add_comment(product_id):
-    comment = request.form.get('comment', '').strip()
-    
-    if not comment:
-        flash('Lütfen yorum yazın!', 'error')
-        return redirect(url_for('product_detail', product_id=product_id))
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # user_id kolonu varsa ekle, yoksa sadece username kullan
-    try:
-        cursor.execute("PRAGMA table_info(comments)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'user_id' in columns:
-            cursor.execute('INSERT INTO comments (product_id, user_id, username, comment) VALUES (?, ?, ?, ?)',
-                          (product_id, session['user_id'], session['username'], comment))
-        else:
-            cursor.execute('INSERT INTO comments (product_id, username, comment) VALUES (?, ?, ?)',
-                          (product_id, session['username'], comment))
-    except Exception as e:
-        print(f"Yorum ekleme hatası: {e}")
-        # Fallback - sadece username ile ekle
-        cursor.execute('INSERT INTO comments (product_id, username, comment) VALUES (?, ?, ?)',
-                      (product_id, session['username'], comment))
-    
-    conn.commit()
-    conn.close()
-    
-    flash('Yorumunuz eklendi!', 'success')
-    return redirect(url_for('product_detail', product_id=product_id))
-
-# ==================== CART & FAVORITES API ====================
-
-@app.route('/api/add-to-cart', methods=['POST'])
-@login_required
-def add_to_cart():
-    data = request.get_json()
-    product_id = data.get('product_id')
-    quantity = int(data.get('quantity', 1))
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Mevcut sepet öğesini kontrol et
-    cursor.execute('SELECT id, quantity FROM cart WHERE user_id = ? AND product_id = ?',
-                  (session['user_id'], product_id))
-    existing = cursor.fetchone()
-    
-    if existing:
-        new_quantity = existing['quantity'] + quantity
-        cursor.execute('UPDATE cart SET quantity = ? WHERE id = ?', (new_quantity, existing['id']))
-    else:
-        cursor.execute('INSERT INTO cart (user_id, product_id, quantity) VALUES (?, ?, ?)',
-                      (session['user_id'], product_id, quantity))
-    
-    conn.commit()
-    
-    # Sepet sayısını al
-    cursor.execute('SELECT COUNT(*) as count FROM cart WHERE user_id = ?', (session['user_id'],))
-    cart_count = cursor.fetchone()['count']
-    
-    conn.close()
-    return jsonify({'success': True, 'message': 'Ürün sepete eklendi', 'cart_count': cart_count})
-
-@app.route('/api/toggle-favorite', methods=['POST'])
-@login_required
-def toggle_favorite():
-    data = request.get_json()
-    product_id = data.get('product_id')
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Favori kontrolü
-    cursor.execute('SELECT id FROM favorites WHERE user_id = ? AND product_id = ?',
-                  (session['user_id'], product_id))
-    favorite = cursor.fetchone()
-    
-    if favorite:
-        cursor.execute('DELETE FROM favorites WHERE id = ?', (favorite['id'],))
-        is_favorite = False
-    else:
-        cursor.execute('INSERT INTO favorites (user_id, product_id) VALUES (?, ?)',
-                      (session['user_id'], product_id))
-        is_favorite = True
-    
-    conn.commit()
-    conn.close()
-    
-    return jsonify({'success': True, 'is_favorite': is_favorite})
-
-@app.route('/cart')
-@login_required
-def cart():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT c.*, p.name, p.price, p.image 
-        FROM cart c 
-        JOIN products p ON c.product_id = p.id 
-        WHERE c.user_id = ?
-    ''', (session['user_id'],))
-    cart_items = cursor.fetchall()
-    
-    total = sum(item['price'] * item['quantity'] for item in cart_items)
-    
-    conn.close()
-    return render_template('cart.html', cart_items=cart_items, total=total)
-
-@app.route('/api/remove-from-cart', methods=['POST'])
-@login_required
-def remove_from_cart():
-    data = request.get_json()
-    cart_id = data.get('cart_id')
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM cart WHERE id = ? AND user_id = ?', (cart_id, session['user_id']))
-    conn.commit()
-    conn.close()
-    
-    return jsonify({'success': True})
-
-@app.route('/api/update-cart', methods=['POST'])
-@login_required
-def update_cart():
-    data = request.get_json()
-    cart_id = data.get('cart_id')
-    quantity = int(data.get('quantity', 1))
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    if quantity <= 0:
-        cursor.execute('DELETE FROM cart WHERE id = ? AND user_id = ?', (cart_id, session['user_id']))
-    else:
-        cursor.execute('UPDATE cart SET quantity = ? WHERE id = ? AND user_id = ?',
-                      (quantity, cart_id, session['user_id']))
-    
-    conn.commit()
-    
-    # Yeni toplamı hesapla
-    cursor.execute('''
-        SELECT SUM(p.price * c.quantity) as total 
-        FROM cart c 
-        JOIN products p ON c.product_id = p.id 
-        WHERE c.user_id = ?
-    ''', (session['user_id'],))
-    total = cursor.fetchone()['total'] or 0
-    
-    conn.close()
-    return jsonify({'success': True, 'total': total})
-
-@app.route('/favorites')
-@login_required
-def favorites():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT p.*, f.id as favorite_id
-        FROM favorites f
-        JOIN products p ON f.product_id = p.id
-        WHERE f.user_id = ?
-        ORDER BY f.created_at DESC
-    ''', (session['user_id'],))
-    favorite_products = cursor.fetchall()
-    
-    conn.close()
-    return render_template('favorites.html', favorite_products=favorite_products)
-
-# ==================== ADMIN PANEL ====================
-
-@app.route('/admin/login', methods=['GET', 'POST'])
-def admin_login():
-    if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        password = request.form.get('password', '').strip()
-        
-        if username == 'admin' and password == 'admin':
-            conn = get_db()
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM users WHERE username = ?', ('admin',))
-            user = cursor.fetchone()
-            conn.close()
-            
-            if user:
-                session['user_id'] = user['id']
-                session['username'] = user['username']
-                session['is_admin'] = 1
-                flash('Admin paneline hoş geldiniz!', 'success')
-                return redirect(url_for('admin_dashboard'))
-        
-        flash('Kullanıcı adı veya şifre hatalı!', 'error')
-        return redirect(url_for('admin_login'))
-    
-    return render_template('admin_login.html')
-
-@app.route('/admin/dashboard')
-@admin_required
-def admin_dashboard():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM products ORDER BY id DESC')
-    products = cursor.fetchall()
-    
-    cursor.execute('SELECT * FROM categories')
-    categories = cursor.fetchall()
-    
-    conn.close()
-    return render_template('admin_dashboard.html', products=products, categories=categories)
-
-@app.route('/admin/add-product', methods=['GET', 'POST'])
-@admin_required
-def admin_add_product():
-    if request.method == 'POST':
-        name = request.form.get('name', '').strip()
-        price = request.form.get('price', '').strip()
-        description = request.form.get('description', '').strip()
-        category_id = request.form.get('category_id', '').strip()
-        file = request.files.get('image')
-        
-        if not name or not price or not category_id:
-            flash('Lütfen zorunlu alanları doldurun!', 'error')
-            return redirect(url_for('admin_add_product'))
-        
-        try:
-            price = float(price)
-        except ValueError:
-            flash('Geçerli bir fiyat girin!', 'error')
-            return redirect(url_for('admin_add_product'))
-        
-        # Görsel yükleme
-        image_filename = None
-        if file and file.filename and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            image_filename = f"{timestamp}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], image_filename)
-            file.save(filepath)
-        
-        # Veritabanına kaydet
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO products (name, price, description, image, category_id)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, price, description, image_filename, category_id))
-        conn.commit()
-        conn.close()
-        
-        flash('Ürün başarıyla eklendi!', 'success')
-        return redirect(url_for('admin_dashboard'))
-    
-    # GET request - formu göster
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM categories')
-    categories = cursor.fetchall()
-    conn.close()
-    
-    return render_template('admin_add_product.html', categories=categories)
-
-@app.route('/admin/delete-product/<int:product_id>', methods=['POST'])
-@admin_required
-def admin_delete_product(product_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Ürün bilgisini al (görsel dosyasını silmek için)
-    cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
-    product = cursor.fetchone()
-    
-    if not product:
-        flash('Ürün bulunamadı!', 'error')
-        conn.close()
-        return redirect(url_for('admin_dashboard'))
-    
-    # İlgili yorumları sil
-    cursor.execute('DELETE FROM comments WHERE product_id = ?', (product_id,))
-    
-    # Sepetten sil
-    cursor.execute('DELETE FROM cart WHERE product_id = ?', (product_id,))
-    
-    # Favorilerden sil
-    cursor.execute('DELETE FROM favorites WHERE product_id = ?', (product_id,))
-    
-    # Ürünü sil
-    cursor.execute('DELETE FROM products WHERE id = ?', (product_id,))
-    
-    conn.commit()
-    conn.close()
-    
-    # Görsel dosyasını sil (varsa)
-    if product['image']:
-        image_path = os.path.join(app.config['UPLOAD_FOLDER'], product['image'])
-        try:
-            if os.path.exists(image_path):
-                os.remove(image_path)
-        except Exception as e:
-            print(f"Görsel silme hatası: {e}")
-    
-    flash('Ürün başarıyla silindi!', 'success')
-    return redirect(url_for('admin_dashboard'))
-
-if __name__ == '__main__':
-    init_db()
-    app.run(debug=True)
+import click
+from flask import Flask, render_template, stream_template, request, redirect, url_for, flash, session, jsonify, make_response
+from flask.cli import AppGroup
+from werkzeug.utils import secure_filename
+from werkzeug.security import generate_password_hash
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import wraps
+
+import assets
+import catalog
+import db
+import images
+import jobs
+import metrics
+import migrate_db
+import passwords
+import popularity
+import related
+from cache import LRUCache, SharedStore, VersionedCache, VersionStamp
+from db import get_db
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = os.environ.get('LITUS_SECRET_KEY', 'litus-secret-key-2024')  # Üretimde ortam değişkeninden verilmeli
+app.config['UPLOAD_FOLDER'] = 'static/uploads'
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
+app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+app.config['IMAGE_FORMATS'] = ['avif', 'webp']  # Üretilecek varyant formatları (Pillow desteğine göre)
+app.config['UPLOAD_STAGING_FOLDER'] = 'uploads_staging'  # İşlenmeyi bekleyen yüklemeler (statik olarak sunulmaz)
+app.config['JOB_WORKER_THREADS'] = 2  # Arka plan iş thread'leri (0: senkron)
+app.config['DATABASE'] = os.environ.get('LITUS_DATABASE', 'database.db')
+app.config['DB_POOL_SIZE'] = 8  # Süreç başına boşta tutulacak en fazla bağlantı
+app.config['SQLITE_PRAGMAS'] = dict(db.STORAGE_PRAGMAS)  # WAL, synchronous=NORMAL, busy_timeout, mmap...
+app.config['DB_WRITE_QUEUE'] = True  # Yazmaları süreç başına tek yazıcı thread'inden geçir
+app.config['CACHE_VERSION_POLL_INTERVAL'] = 1.0  # sn - önbellek sürüm damgası yoklama aralığı
+app.config['USER_CACHE_SIZE'] = 4096
+app.config['USER_CACHE_TTL'] = 30  # sn - yetki değişikliği diğer worker'lara en geç bu sürede yansır
+app.config['PRODUCTS_PER_PAGE'] = 24
+app.config['ADMIN_PRODUCTS_PER_PAGE'] = 50
+app.config['SEARCH_RESULTS_PER_PAGE'] = 24
+app.config['COMMENTS_PER_PAGE'] = 20
+app.config['CART_BATCH_MAX_OPERATIONS'] = 100  # /api/cart/batch isteği başına en fazla işlem
+app.config['GUEST_CART_MAX_ITEMS'] = 50  # Misafir sepeti çerezde tutulur; çerez boyutu için sınır
+app.config['N_PLUS_ONE_THRESHOLD'] = 20  # İstek başına bundan fazla SQL sorgusu uyarı loglar
+app.config['PAGE_CACHE_ENABLED'] = True  # Anonim katalog sayfaları için tam sayfa önbellek
+app.config['PAGE_CACHE_MAX_ENTRIES'] = 2048
+app.config['PAGE_CACHE_MAX_BYTES'] = 64 * 1024 * 1024  # 64MB
+app.config['PRODUCT_CACHE_SIZE'] = 4096  # Ürün detay önbelleği (ürün + ilk yorum sayfası)
+app.config['PRODUCT_CACHE_MAX_BYTES'] = 32 * 1024 * 1024  # 32MB
+app.config['PRODUCT_CACHE_STORE'] = os.environ.get('LITUS_PRODUCT_CACHE_STORE')  # Worker'lar arası paylaşılan disk deposu (SQLite dosyası)
+app.config['FAVORITES_CACHE_TTL'] = 30  # sn - kullanıcı favori kümesi
+app.config['RELATED_PRODUCTS_K'] = 12  # Ürün başına saklanan komşu (flask rebuild-related)
+app.config['RELATED_PRODUCTS_SHOWN'] = 4  # Detay sayfasında gösterilen ilgili ürün
+app.config['POPULARITY_FLUSH_INTERVAL'] = 10.0  # sn - görüntülenme sayaçlarının toplu yazılma aralığı
+app.config['POPULARITY_HALF_LIFE'] = 12 * 3600  # sn - trend skorunun yarı ömrü
+app.config['HOME_PRODUCTS'] = 8  # Ana sayfadaki her bölümde gösterilen ürün
+app.config['HOME_PAGE_CACHE_TTL'] = 60  # sn - trend sıralaması anonim ana sayfaya en geç bu sürede yansır
+
+# Upload klasörlerini oluştur
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(app.config['UPLOAD_STAGING_FOLDER'], exist_ok=True)
+
+# Veritabanı bağlantı havuzu (istek başına tek bağlantı, teardown'da iade)
+db.init_app(app)
+
+# İstek süresi ve SQL sorgu ölçümleri (/admin/metrics, Server-Timing, N+1 uyarısı)
+metrics.init_app(app)
+
+# Arka plan iş kuyruğu (görsel işleme, dosya temizliği)
+jobs.init_app(app)
+
+# Şifre hash'leme süreç havuzunda, sınırlı kuyrukla (dolunca 429)
+passwords.init_app(app)
+
+# Görüntülenme/sepet/favori sayaçları bellekte toplanır, periyodik olarak toplu yazılır
+popularity.init_app(app)
+
+# Küçültülmüş, hash'li ve önceden sıkıştırılmış CSS/JS (flask --app app build-assets)
+assets.init_app(app)
+
+# Kategori önbelleği - kategoriler nadiren değişir, her render'da sorgulanmaz
+def _load_categories(conn):
+    return [dict(row) for row in conn.execute('SELECT * FROM categories ORDER BY id')]
+
+def get_categories():
+    return category_cache.get(get_db())
+
+def get_category(category_id):
+    for cat in get_categories():
+        if cat['id'] == category_id:
+            return cat
+    return None
+
+# Kullanıcı profil önbelleği - sadece template'lerin kullandığı alanlar (şifre hash'i yok)
+def get_current_user():
+    user_id = session.get('user_id')
+    if user_id is None:
+        return None
+    user = user_cache.get(user_id)
+    if user is None:
+        row = get_db().execute('SELECT id, username, is_admin FROM users WHERE id = ?', (user_id,)).fetchone()
+        if row is None:
+            return None
+        user = dict(row)
+        user_cache.set(user_id, user)
+    return user
+
+# Girişte taze kullanıcı bilgisiyle önbelleği doldur
+def cache_user(user):
+    user_cache.set(user['id'], {'id': user['id'], 'username': user['username'], 'is_admin': user['is_admin']})
+
+# Çıkışta veya yetki değişikliğinde çağrılmalı
+def invalidate_user(user_id):
+    user_cache.delete(user_id)
+
+# Ürün detay önbelleği - ürün satırı ve ilk yorum sayfası, ürün id'sine göre
+# Kayıt yüklendiği andaki 'catalog' sürümünü ve products.updated_at değerini taşır.
+# Sürüm değişmediyse veritabanına gidilmez; değiştiyse tek bir PK sorgusuyla
+# updated_at karşılaştırılır ve yalnızca gerçekten değişen ürün yeniden yüklenir.
+# PRODUCT_CACHE_STORE verilirse kayıtlar worker'ların paylaştığı disk deposuna da yazılır.
+def _load_product_view(conn, product_id):
+    product = conn.execute('SELECT * FROM products WHERE id = ?', (product_id,)).fetchone()
+    if product is None:
+        return None
+    comments, next_cursor = fetch_comment_page(product_id, limit=app.config['COMMENTS_PER_PAGE'])
+    entry = {
+        'product': dict(product),
+        'comments': [dict(comment) for comment in comments],
+        'next_cursor': next_cursor,
+        'updated_at': product['updated_at'],
+    }
+    entry['size'] = len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+    return entry
+
+def get_product_view(product_id):
+    conn = get_db()
+    version = catalog_version.current(conn)
+    entry = product_cache.get(product_id)
+    if entry is not None and entry['version'] == version:
+        return entry
+
+    row = conn.execute('SELECT updated_at FROM products WHERE id = ?', (product_id,)).fetchone()
+    if row is None:
+        invalidate_product(product_id)
+        return None
+    if entry is None and product_store is not None:
+        entry = product_store.get(product_id)
+    if entry is None or entry['updated_at'] != row['updated_at']:
+        entry = _load_product_view(conn, product_id)
+        if entry is None:
+            return None
+        if product_store is not None:
+            product_store.set(product_id, entry)
+    entry = dict(entry, version=version)
+    product_cache.set(product_id, entry)
+    return entry
+
+# Ürünü veya yorumlarını değiştiren her yazma yolunda çağrılmalı
+def invalidate_product(product_id):
+    product_cache.delete(product_id)
+    if product_store is not None:
+        product_store.delete(product_id)
+    catalog_version.invalidate()
+
+# Kullanıcı başına favori ürün id'leri kümesi
+# Bu süreçteki yazmalar kümeyi hemen günceller; diğer worker'lara en geç TTL sonra yansır.
+def get_favorite_ids(user_id):
+    favorite_ids = favorites_cache.get(user_id)
+    if favorite_ids is None:
+        rows = get_db().execute('SELECT product_id FROM favorites WHERE user_id = ?', (user_id,))
+        favorite_ids = frozenset(row['product_id'] for row in rows)
+        favorites_cache.set(user_id, favorite_ids)
+    return favorite_ids
+
+def invalidate_favorites(user_id):
+    favorites_cache.delete(user_id)
+
+# Yukarıdaki önbellekleri ve sürüm damgalarını ayarlardan kur
+# İçe aktarmada bir kez çağrılır; wsgi.create_app(config) ayarları değiştirdikten sonra
+# yeniden çağırır (eski içerikler atılır).
+def configure_caches():
+    global category_cache, user_cache, catalog_version, page_cache, _page_cache_version
+    global related_version, product_cache, product_store, favorites_cache
+    poll_interval = app.config['CACHE_VERSION_POLL_INTERVAL']
+    category_cache = VersionedCache('categories', _load_categories, poll_interval=poll_interval)
+    user_cache = LRUCache(maxsize=app.config['USER_CACHE_SIZE'], ttl=app.config['USER_CACHE_TTL'])
+    # Anonim ziyaretçiler için sayfa önbelleği
+    # Anahtar: tam yol + sorgu dizesi. Ürün, kategori veya yorum yazıldığında 'catalog'
+    # sürüm damgası artar ve önbellek tamamen boşaltılır.
+    catalog_version = VersionStamp('catalog', poll_interval=poll_interval)
+    page_cache = LRUCache(maxsize=app.config['PAGE_CACHE_MAX_ENTRIES'],
+                          maxbytes=app.config['PAGE_CACHE_MAX_BYTES'],
+                          sizeof=lambda entry: len(entry[0]))
+    _page_cache_version = None
+    # related_products tablosu her yeniden hesaplandığında artar (flask rebuild-related)
+    related_version = VersionStamp('related', poll_interval=poll_interval)
+    product_cache = LRUCache(maxsize=app.config['PRODUCT_CACHE_SIZE'],
+                             maxbytes=app.config['PRODUCT_CACHE_MAX_BYTES'],
+                             sizeof=lambda entry: entry['size'])
+    product_store = SharedStore(app.config['PRODUCT_CACHE_STORE']) if app.config['PRODUCT_CACHE_STORE'] else None
+    favorites_cache = LRUCache(maxsize=app.config['USER_CACHE_SIZE'], ttl=app.config['FAVORITES_CACHE_TTL'])
+
+configure_caches()
+
+# max_age verilirse kayıt ayrıca bu kadar saniye sonra eskir (sürüm damgasına bağlı olmayan içerik için)
+# Ayar sonradan değişebileceği için istek anında çağrılan bir fonksiyon da olabilir.
+def cache_page(f=None, *, max_age=None):
+    if f is None:
+        return lambda f: cache_page(f, max_age=max_age)
+    
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        global _page_cache_version
+        # Giriş yapmış kullanıcılar ve bekleyen flash mesajı olan oturumlar önbelleğe girmez
+        if (not app.config['PAGE_CACHE_ENABLED'] or request.method != 'GET'
+                or 'user_id' in session or session.get('_flashes')):
+            return f(*args, **kwargs)
+        
+        version = catalog_version.current(get_db())
+        if version != _page_cache_version:
+            page_cache.clear()
+            _page_cache_version = version
+        
+        key = request.full_path
+        cached = page_cache.get(key)
+        if cached is not None and (cached[2] is None or cached[2] > time.monotonic()):
+            body, mimetype, _ = cached
+            response = app.response_class(body, mimetype=mimetype)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        
+        response = make_response(f(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed and not session.modified:
+            ttl = max_age() if callable(max_age) else max_age
+            expires = time.monotonic() + ttl if ttl else None
+            page_cache.set(key, (response.get_data(), response.mimetype, expires))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return decorated_function
+
+# Koşullu GET (ETag / Last-Modified)
+# stamp_fn(conn, **view_args) sayfayı render etmeden ucuz bir değişiklik damgası döndürür:
+# (token, son değişiklik zamanı) veya None (damga yok - normal akış).
+# ETag; damga, kategori menüsü sürümü, statik derleme kimliği, kullanıcı ve tam yoldan türetilir.
+def _parse_stamp(value):
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
+
+def conditional_page(stamp_fn):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if session.get('_flashes'):
+                return f(*args, **kwargs)
+            conn = get_db()
+            stamp = stamp_fn(conn, **kwargs)
+            if stamp is None:
+                return f(*args, **kwargs)
+            
+            token, last_modified = stamp
+            get_categories()
+            # Derleme değişince sayfa da değişir (hash'li CSS/JS adları)
+            build_id, built_at = assets.build_info()
+            if last_modified and built_at:
+                last_modified = max(last_modified, built_at)
+            raw = f"{token}|{category_cache.version}|{build_id}|{session.get('user_id', '')}|{request.full_path}"
+            etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+            cache_control = 'private, no-cache' if 'user_id' in session else 'public, no-cache'
+            
+            if request.if_none_match.contains(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorated_function
+    return decorator
+
+# İlgili ürünler bölümü: komşu tablosu yenilendiğinde veya ürünün kategorisi
+# (yedek liste) değiştiğinde sayfa da değişmiş sayılır
+def _product_stamp(conn, product_id):
+    row = conn.execute('''
+        SELECT p.updated_at, s.version AS category_version, s.updated_at AS category_updated_at
+        FROM products p
+        LEFT JOIN category_stamps s ON s.category_id = p.category_id
+        WHERE p.id = ?
+    ''', (product_id,)).fetchone()
+    if row is None:
+        return None
+    token = f"{row['updated_at']}|{row['category_version']}|{related_version.current(conn)}"
+    # Favori butonu kullanıcıya göre değişir
+    if 'user_id' in session:
+        favorite = product_id in get_favorite_ids(session['user_id'])
+        token = f'{token}|{1 if favorite else 0}'
+    stamps = [_parse_stamp(row['updated_at']), _parse_stamp(row['category_updated_at'])]
+    return token, max(filter(None, stamps), default=None)
+
+def _category_stamp(conn, category_id):
+    if get_category(category_id) is None:
+        return None
+    row = conn.execute('SELECT version, updated_at FROM category_stamps WHERE category_id = ?',
+                       (category_id,)).fetchone()
+    if row is None:
+        return '0', None
+    return str(row['version']), _parse_stamp(row['updated_at'])
+
+# Ürün listeleme sıralamaları: (kolon, yön)
+PRODUCT_SORTS = {
+    'newest': ('id', 'DESC'),
+    'oldest': ('id', 'ASC'),
+    'price_asc': ('price', 'ASC'),
+    'price_desc': ('price', 'DESC'),
+}
+
+PRODUCT_SORT_LABELS = {
+    'newest': 'En Yeni',
+    'oldest': 'En Eski',
+    'price_asc': 'Fiyat (Artan)',
+    'price_desc': 'Fiyat (Azalan)',
+}
+
+def _product_order(sort):
+    column, direction = PRODUCT_SORTS.get(sort, PRODUCT_SORTS['newest'])
+    if column == 'id':
+        return column, direction, f'id {direction}'
+    return column, direction, f'{column} {direction}, id {direction}'
+
+# Keyset (cursor) sayfalama - OFFSET yerine son görülen satırdan devam eder
+# Cursor id sıralamasında "id", fiyat sıralamasında "fiyat:id" biçimindedir.
+def fetch_product_page(where='', params=(), sort='newest', after=None, limit=24):
+    column, direction, order = _product_order(sort)
+    op = '<' if direction == 'DESC' else '>'
+    clauses = [where] if where else []
+    args = list(params)
+    
+    if after:
+        try:
+            if column == 'id':
+                last_id = int(after)
+                clauses.append(f'id {op} ?')
+                args.append(last_id)
+            else:
+                value, last_id = after.rsplit(':', 1)
+                clauses.append(f'({column}, id) {op} (?, ?)')
+                args.extend([float(value), int(last_id)])
+        except ValueError:
+            pass  # Bozuk cursor - ilk sayfayı göster
+    
+    sql = 'SELECT * FROM products'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    sql += f' ORDER BY {order} LIMIT ?'
+    products = get_db().execute(sql, args + [limit + 1]).fetchall()
+    
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last = products[-1]
+        next_cursor = str(last['id']) if column == 'id' else f"{last[column]!r}:{last['id']}"
+    return products, next_cursor
+
+# Yorumlar yeniden eskiye, (created_at, id) keyset ile sayfalanır
+# idx_comments_product_created indeksi (rowid dahil) sıralamayı karşılar; cursor "created_at:id" biçimindedir.
+def fetch_comment_page(product_id, after=None, limit=20):
+    sql = 'SELECT id, username, comment, created_at FROM comments WHERE product_id = ?'
+    args = [product_id]
+    if after:
+        try:
+            created_at, last_id = after.rsplit(':', 1)
+            sql += ' AND (created_at, id) < (?, ?)'
+            args.extend([created_at, int(last_id)])
+        except ValueError:
+            pass  # Bozuk cursor - ilk sayfayı göster
+    sql += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    comments = get_db().execute(sql, args + [limit + 1]).fetchall()
+    
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = f"{comments[-1]['created_at']}:{comments[-1]['id']}"
+    return comments, next_cursor
+
+# Tüm ürünleri belleğe almadan satır satır üret (stream_template için)
+def iter_products(sort='newest'):
+    _, _, order = _product_order(sort)
+    yield from get_db().execute(f'SELECT * FROM products ORDER BY {order}')
+
+# Veritabanını başlat
+def init_db():
+    conn = db.connect(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'])
+    cursor = conn.cursor()
+    
+    # Tablolar ve indeksler - sürümlü migration'lar
+    migrate_db.migrate(conn)
+    
+    # Admin kullanıcısı oluştur
+    cursor.execute('SELECT COUNT(*) FROM users WHERE username = ?', ('admin',))
+    if cursor.fetchone()[0] == 0:
+        admin_password = generate_password_hash('admin', method=app.config['PASSWORD_HASH_METHOD'],
+                                                salt_length=app.config['PASSWORD_SALT_LENGTH'])
+        cursor.execute('INSERT INTO users (username, email, password, is_admin) VALUES (?, ?, ?, ?)',
+                      ('admin', 'admin@litus.com', admin_password, 1))
+    
+    # Örnek kategoriler ekle
+    cursor.execute('SELECT COUNT(*) FROM categories')
+    if cursor.fetchone()[0] == 0:
+        categories = ['Kadın', 'Erkek', 'Çocuk', 'Aksesuar', 'Koleksiyon']
+        for cat in categories:
+            cursor.execute('INSERT INTO categories (name) VALUES (?)', (cat,))
+    
+    conn.commit()
+    
+    # Kategori önbelleğini ısıt
+    category_cache.clear()
+    category_cache.get(conn)
+    conn.close()
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+
+# Template'ler için <picture> verisi (srcset, sizes, width/height)
+@app.template_global()
+def picture_data(product, sizes=None, prefer='medium'):
+    return images.picture_data(product, lambda name: url_for('static', filename='uploads/' + name),
+                               sizes=sizes, prefer=prefer)
+
+# Yüklenen görseller içerik adresli (ad = içeriğin SHA-256'sı); aynı adın içeriği
+# hiç değişmediği için tarayıcı yeniden doğrulama yapmadan bir yıl saklayabilir.
+@app.after_request
+def cache_uploads(response):
+    filename = (request.view_args or {}).get('filename', '')
+    if request.endpoint == 'static' and filename.startswith('uploads/') and response.status_code in (200, 304):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+# Login required decorator
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Bu sayfaya erişmek için giriş yapmalısınız!', 'error')
+            return redirect(url_for('login'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Admin required decorator
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Bu sayfaya erişmek için giriş yapmalısınız!', 'error')
+            return redirect(url_for('login'))
+        user = get_current_user()
+        if not user or user['is_admin'] != 1:
+            flash('Bu sayfaya erişim yetkiniz yok!', 'error')
+            return redirect(url_for('index'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Context processor - tüm template'lere categories ve user bilgisi ekle
+@app.context_processor
+def inject_categories():
+    return dict(categories=get_categories(), current_user=get_current_user())
+
+# ==================== AUTH ROUTES ====================
+
+@app.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        email = request.form.get('email', '').strip()
+        password = request.form.get('password', '').strip()
+        confirm_password = request.form.get('confirm_password', '').strip()
+        
+        if not username or not email or not password:
+            flash('Lütfen tüm alanları doldurun!', 'error')
+            return redirect(url_for('register'))
+        
+        if password != confirm_password:
+            flash('Şifreler eşleşmiyor!', 'error')
+            return redirect(url_for('register'))
+        
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        # Kullanıcı adı kontrolü
+        cursor.execute('SELECT id FROM users WHERE username = ?', (username,))
+        if cursor.fetchone():
+            flash('Bu kullanıcı adı zaten kullanılıyor!', 'error')
+            return redirect(url_for('register'))
+        
+        # Email kontrolü
+        cursor.execute('SELECT id FROM users WHERE email = ?', (email,))
+        if cursor.fetchone():
+            flash('Bu e-posta adresi zaten kullanılıyor!', 'error')
+            return redirect(url_for('register'))
+        
+        # Kullanıcı oluştur
+        hashed_password = passwords.hash_password(password)
+        user_id = db.execute_write('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                                   (username, email, hashed_password)).lastrowid
+        
+        session['user_id'] = user_id
+        session['username'] = username
+        cache_user({'id': user_id, 'username': username, 'is_admin': 0})
+        merge_guest_cart(user_id)
+        flash('Kayıt başarılı! Hoş geldiniz!', 'success')
+        return redirect(url_for('index'))
+    
+    return render_template('register.html')
+
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        if not username or not password:
+            flash('Lütfen kullanıcı adı ve şifre girin!', 'error')
+            return redirect(url_for('login'))
+        
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+        user = cursor.fetchone()
+        
+        valid, new_hash = passwords.verify_password(user['password'], password) if user else (False, None)
+        if valid:
+            # Hash parametreleri değiştiyse kayıtlı hash'i yenile
+            if new_hash:
+                db.execute_write('UPDATE users SET password = ? WHERE id = ? AND password = ?',
+                                 (new_hash, user['id'], user['password']))
+            session['user_id'] = user['id']
+            session['username'] = user['username']
+            session['is_admin'] = user['is_admin']
+            cache_user(user)
+            merge_guest_cart(user['id'])
+            
+            if user['is_admin'] == 1:
+                flash('Admin paneline hoş geldiniz!', 'success')
+                return redirect(url_for('admin_dashboard'))
+            else:
+                flash('Giriş başarılı! Hoş geldiniz!', 'success')
+                return redirect(url_for('index'))
+        else:
+            flash('Kullanıcı adı veya şifre hatalı!', 'error')
+            return redirect(url_for('login'))
+    
+    return render_template('login.html')
+
+# Hash kuyruğu doluysa isteği bekletmeden geri çevir
+@app.errorhandler(passwords.Overloaded)
+def password_hash_overloaded(e):
+    flash('Şu anda çok fazla giriş isteği var, lütfen birkaç saniye sonra tekrar deneyin.', 'error')
+    template = 'register.html' if request.endpoint == 'register' else 'login.html'
+    return render_template(template), 429, {'Retry-After': str(e.retry_after)}
+
+@app.route('/logout')
+def logout():
+    if 'user_id' in session:
+        invalidate_user(session['user_id'])
+    session.clear()
+    flash('Çıkış yapıldı!', 'success')
+    return redirect(url_for('index'))
+
+# ==================== MAIN ROUTES ====================
+
+@app.route('/')
+@cache_page(max_age=lambda: app.config['HOME_PAGE_CACHE_TTL'])
+def index():
+    conn = get_db()
+    cursor = conn.cursor()
+    limit = app.config['HOME_PRODUCTS']
+    
+    # Kategorileri al
+    categories = get_categories()
+    
+    # Öne çıkan ürünler (en yeniler)
+    cursor.execute('SELECT * FROM products ORDER BY id DESC LIMIT ?', (limit,))
+    featured_products = cursor.fetchall()
+    
+    # Trend ve en çok görüntülenen ürünler (product_stats indekslerinden; sayaçlar toplu yazılır)
+    trending_products = conn.execute('''
+        SELECT p.* FROM product_stats s JOIN products p ON p.id = s.product_id
+        ORDER BY s.trend DESC LIMIT ?
+    ''', (limit,)).fetchall()
+    most_viewed_products = conn.execute('''
+        SELECT p.* FROM product_stats s JOIN products p ON p.id = s.product_id
+        WHERE s.views > 0
+        ORDER BY s.views DESC LIMIT ?
+    ''', (limit,)).fetchall()
+    
+    return render_template('index.html', categories=categories, featured_products=featured_products,
+                           trending_products=trending_products, most_viewed_products=most_viewed_products)
+
+@app.route('/category/<int:category_id>')
+@conditional_page(_category_stamp)
+@cache_page
+def category(category_id):
+    # Kategori bilgisi
+    category = get_category(category_id)
+    
+    if not category:
+        flash('Kategori bulunamadı!', 'error')
+        return redirect(url_for('index'))
+    
+    # Kategoriye ait ürünler (sayfalı)
+    sort = request.args.get('sort', 'newest')
+    if sort not in PRODUCT_SORTS:
+        sort = 'newest'
+    products, next_cursor = fetch_product_page('category_id = ?', (category_id,), sort=sort,
+                                               after=request.args.get('after'),
+                                               limit=app.config['PRODUCTS_PER_PAGE'])
+    
+    return render_template('category.html', category=category, products=products,
+                           sort=sort, sorts=PRODUCT_SORT_LABELS, next_cursor=next_cursor,
+                           is_first_page=not request.args.get('after'))
+
+# Görüntülenmeyi say (önbellekten veya 304 ile dönen yanıtlar dahil); yazma periyodik ve topludur
+def count_view(f):
+    @wraps(f)
+    def decorated_function(product_id, **kwargs):
+        response = make_response(f(product_id=product_id, **kwargs))
+        if response.status_code in (200, 304):
+            popularity.record(product_id)
+        return response
+    return decorated_function
+
+@app.route('/product/<int:product_id>')
+@count_view
+@conditional_page(_product_stamp)
+@cache_page
+def product_detail(product_id):
+    # Ürün bilgisi ve yorumların ilk sayfası (önbellekten; devamı /api/product/<id>/comments ile yüklenir)
+    view = get_product_view(product_id)
+    
+    if not view:
+        flash('Ürün bulunamadı!', 'error')
+        return redirect(url_for('index'))
+    
+    # Favori kontrolü (kullanıcının bellekteki favori kümesinden)
+    is_favorite = 'user_id' in session and product_id in get_favorite_ids(session['user_id'])
+    
+    return render_template('product_detail.html', product=view['product'], comments=view['comments'],
+                           next_cursor=view['next_cursor'], is_favorite=is_favorite,
+                           related_products=get_related_products(view['product']))
+
+# Önceden hesaplanmış komşular (birincil anahtar aralığı, tek sorgu); yetmezse aynı kategoriden en yeniler
+def get_related_products(product):
+    limit = app.config['RELATED_PRODUCTS_SHOWN']
+    conn = get_db()
+    products = conn.execute('''
+        SELECT p.*
+        FROM related_products r
+        JOIN products p ON p.id = r.related_id
+        WHERE r.product_id = ?
+        ORDER BY r.rank
+        LIMIT ?
+    ''', (product['id'], limit)).fetchall()
+    if len(products) < limit:
+        exclude = [product['id']] + [row['id'] for row in products]
+        products += conn.execute(f'''
+            SELECT * FROM products
+            WHERE category_id = ? AND id NOT IN ({', '.join('?' * len(exclude))})
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (product['category_id'], *exclude, limit - len(products))).fetchall()
+    return products
+
+@app.route('/api/product/<int:product_id>/comments')
+def api_product_comments(product_id):
+    limit = max(1, min(request.args.get('limit', app.config['COMMENTS_PER_PAGE'], type=int), 100))
+    comments, next_cursor = fetch_comment_page(product_id, after=request.args.get('after'), limit=limit)
+    return jsonify({
+        'success': True,
+        'comments': [{'id': c['id'], 'username': c['username'], 'comment': c['comment'],
+                      'created_at': c['created_at']} for c in comments],
+        'next_cursor': next_cursor,
+    })
+
+@app.route('/product/<int:product_id>/comment', methods=['POST'])
+@login_required
+def add_comment(product_id):
+    comment = request.form.get('comment', '').strip()
+    
+    if not comment:
+        flash('Lütfen yorum yazın!', 'error')
+        return redirect(url_for('product_detail', product_id=product_id))
+    
+    db.execute_write('INSERT INTO comments (product_id, user_id, username, comment) VALUES (?, ?, ?, ?)',
+                     (product_id, session['user_id'], session['username'], comment))
+    invalidate_product(product_id)
+    
+    flash('Yorumunuz eklendi!', 'success')
+    return redirect(url_for('product_detail', product_id=product_id))
+
+# ==================== SEARCH ====================
+
+# Türkçe harf katlama - indeksle aynı kural: 'ı' -> 'i', gerisini unicode61 yapar
+def fold_turkish(text):
+    return text.replace('ı', 'i').replace('I', 'i').replace('İ', 'i')
+
+# Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevir: her kelime önek araması, kelimeler AND
+def build_search_query(text):
+    terms = re.findall(r'\w+', fold_turkish(text))[:10]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+_fts_available = None
+
+def fts_available(conn):
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'").fetchone() is not None
+    return _fts_available
+
+def search_products(text, category_id=None, limit=24, offset=0):
+    conn = get_db()
+    query = build_search_query(text)
+    if not query:
+        return []
+    
+    if fts_available(conn):
+        # bm25: isim eşleşmeleri açıklamadan 10 kat ağır
+        sql = '''
+            SELECT p.* FROM products_fts
+            JOIN products p ON p.id = products_fts.rowid
+            WHERE products_fts MATCH ?
+        '''
+        args = [query]
+        if category_id:
+            sql += ' AND p.category_id = ?'
+            args.append(category_id)
+        sql += ' ORDER BY bm25(products_fts, 10.0, 1.0) LIMIT ? OFFSET ?'
+    else:
+        # FTS5 yoksa yavaş yol
+        sql = 'SELECT * FROM products WHERE (name LIKE ? OR description LIKE ?)'
+        args = [f'%{text}%', f'%{text}%']
+        if category_id:
+            sql += ' AND category_id = ?'
+            args.append(category_id)
+        sql += ' ORDER BY id DESC LIMIT ? OFFSET ?'
+    return conn.execute(sql, args + [limit, offset]).fetchall()
+
+def _search_args():
+    text = request.args.get('q', '').strip()
+    category_id = request.args.get('category', type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
+    return text, category_id, page
+
+@app.route('/search')
+def search():
+    text, category_id, page = _search_args()
+    per_page = app.config['SEARCH_RESULTS_PER_PAGE']
+    
+    # Sıralama skora göre olduğu için keyset yerine sınırlı OFFSET kullanılır
+    products = search_products(text, category_id, limit=per_page + 1, offset=(page - 1) * per_page)
+    has_next = len(products) > per_page
+    
+    return render_template('search.html', query=text, products=products[:per_page],
+                           selected_category=category_id, page=page, has_next=has_next)
+
+@app.route('/api/search')
+def api_search():
+    text, category_id, page = _search_args()
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    products = search_products(text, category_id, limit=limit, offset=(page - 1) * limit)
+    return jsonify({
+        'query': text,
+        'results': [{'id': p['id'], 'name': p['name'], 'price': p['price'],
+                     'image': p['image'], 'category_id': p['category_id'],
+                     'comment_count': p['comment_count']} for p in products],
+    })
+
+# ==================== CART & FAVORITES API ====================
+
+# Sepetteki satır sayısı, toplam adet ve tutar (tek sorgu)
+def _cart_summary(conn, user_id):
+    row = conn.execute('''
+        SELECT COUNT(*) AS count, COALESCE(SUM(c.quantity), 0) AS quantity,
+               COALESCE(SUM(p.price * c.quantity), 0) AS total
+        FROM cart c
+        JOIN products p ON c.product_id = p.id
+        WHERE c.user_id = ?
+    ''', (user_id,)).fetchone()
+    return {'cart_count': row['count'], 'quantity': row['quantity'], 'total': row['total']}
+
+# Tek sepet sorgusunu çalıştır ve aynı transaction'da güncel özeti döndür
+# Çift tıklama gibi eşzamanlı istekler birbirinin ara durumunu görmez.
+def _cart_write(sql, params, user_id):
+    def run(conn):
+        conn.execute(sql, params)
+        return _cart_summary(conn, user_id)
+    return db.write(run)
+
+# Misafir sepeti: imzalı session çerezinde {ürün id: adet}
+# Giriş yapılana kadar veritabanına hiç yazılmaz; login/register'da tek sorguyla birleştirilir.
+# Misafir sepet satırlarında cart_id olarak ürün id'si kullanılır.
+def _guest_cart():
+    return session.get('guest_cart', {})
+
+def _save_guest_cart(cart):
+    session['guest_cart'] = cart
+
+def _guest_cart_items(conn, cart):
+    if not cart:
+        return []
+    placeholders = ','.join('?' * len(cart))
+    rows = conn.execute(f'''
+        SELECT id, id AS product_id, name, price, image, image_width, image_height, image_variants
+        FROM products WHERE id IN ({placeholders})
+    ''', [int(product_id) for product_id in cart]).fetchall()
+    return [dict(row, quantity=cart[str(row['id'])]) for row in rows]
+
+def _guest_cart_summary(conn, cart):
+    items = _guest_cart_items(conn, cart)
+    return {
+        'cart_count': len(items),
+        'quantity': sum(item['quantity'] for item in items),
+        'total': sum(item['price'] * item['quantity'] for item in items),
+    }
+
+# Misafir sepetini kullanıcının sepetine tek toplu upsert ile aktar (silinmiş ürünler atlanır)
+def merge_guest_cart(user_id):
+    cart = session.pop('guest_cart', None)
+    if not cart:
+        return 0
+    return db.execute_write('''
+        INSERT INTO cart (user_id, product_id, quantity)
+        SELECT ?, p.id, j.value
+        FROM json_each(?) j
+        JOIN products p ON p.id = CAST(j.key AS INTEGER)
+        WHERE j.value > 0
+        ON CONFLICT(user_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+    ''', (user_id, json.dumps(cart))).rowcount
+
+@app.route('/api/cart/summary')
+def cart_summary():
+    if 'user_id' not in session:
+        return jsonify({'success': True, **_guest_cart_summary(get_db(), _guest_cart())})
+    return jsonify({'success': True, **_cart_summary(get_db(), session['user_id'])})
+
+@app.route('/api/add-to-cart', methods=['POST'])
+def add_to_cart():
+    data = request.get_json()
+    product_id = data.get('product_id')
+    quantity = int(data.get('quantity', 1))
+    
+    if 'user_id' not in session:
+        conn = get_db()
+        if not conn.execute('SELECT 1 FROM products WHERE id = ?', (product_id,)).fetchone():
+            return jsonify({'success': False, 'message': 'Ürün bulunamadı'}), 404
+        if quantity <= 0:
+            return jsonify({'success': False, 'message': 'Geçersiz miktar'}), 400
+        cart = dict(_guest_cart())
+        key = str(product_id)
+        if key not in cart and len(cart) >= app.config['GUEST_CART_MAX_ITEMS']:
+            return jsonify({'success': False, 'message': 'Sepetiniz dolu, devam etmek için giriş yapın'}), 400
+        cart[key] = cart.get(key, 0) + quantity
+        _save_guest_cart(cart)
+        popularity.record(product_id, 'cart')
+        return jsonify({'success': True, 'message': 'Ürün sepete eklendi', **_guest_cart_summary(conn, cart)})
+    
+    if quantity <= 0:
+        return jsonify({'success': False, 'message': 'Geçersiz miktar'}), 400
+    
+    user_id = session['user_id']
+    
+    # Varsa miktarı artır, yoksa ekle (UNIQUE(user_id, product_id) üzerinden tek sorgu)
+    summary = _cart_write('''
+        INSERT INTO cart (user_id, product_id, quantity) VALUES (?, ?, ?)
+        ON CONFLICT(user_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+    ''', (user_id, product_id, quantity), user_id)
+    popularity.record(product_id, 'cart')
+    
+    return jsonify({'success': True, 'message': 'Ürün sepete eklendi', **summary})
+
+@app.route('/api/toggle-favorite', methods=['POST'])
+@login_required
+def toggle_favorite():
+    data = request.get_json()
+    product_id = data.get('product_id')
+    
+    user_id = session['user_id']
+    
+    def toggle(conn):
+        # Favori varsa sil, yoksa ekle
+        cursor = conn.execute('DELETE FROM favorites WHERE user_id = ? AND product_id = ?',
+                              (user_id, product_id))
+        if cursor.rowcount:
+            return False
+        conn.execute('INSERT INTO favorites (user_id, product_id) VALUES (?, ?)',
+                     (user_id, product_id))
+        return True
+    
+    is_favorite = db.write(toggle)
+    invalidate_favorites(user_id)
+    if is_favorite:
+        popularity.record(product_id, 'favorite')
+    
+    return jsonify({'success': True, 'is_favorite': is_favorite})
+
+@app.route('/cart')
+def cart():
+    conn = get_db()
+    
+    if 'user_id' not in session:
+        cart_items = _guest_cart_items(conn, _guest_cart())
+        total = sum(item['price'] * item['quantity'] for item in cart_items)
+        return render_template('cart.html', cart_items=cart_items, total=total)
+    
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT c.*, p.name, p.price, p.image, p.image_width, p.image_height, p.image_variants 
+        FROM cart c 
+        JOIN products p ON c.product_id = p.id 
+        WHERE c.user_id = ?
+    ''', (session['user_id'],))
+    cart_items = cursor.fetchall()
+    
+    total = sum(item['price'] * item['quantity'] for item in cart_items)
+    
+    return render_template('cart.html', cart_items=cart_items, total=total)
+
+@app.route('/api/remove-from-cart', methods=['POST'])
+def remove_from_cart():
+    data = request.get_json()
+    cart_id = data.get('cart_id')
+    
+    if 'user_id' not in session:
+        cart = dict(_guest_cart())
+        cart.pop(str(cart_id), None)
+        _save_guest_cart(cart)
+        return jsonify({'success': True, **_guest_cart_summary(get_db(), cart)})
+    
+    summary = _cart_write('DELETE FROM cart WHERE id = ? AND user_id = ?',
+                          (cart_id, session['user_id']), session['user_id'])
+    
+    return jsonify({'success': True, **summary})
+
+@app.route('/api/update-cart', methods=['POST'])
+def update_cart():
+    data = request.get_json()
+    cart_id = data.get('cart_id')
+    quantity = int(data.get('quantity', 1))
+    
+    if 'user_id' not in session:
+        cart = dict(_guest_cart())
+        if quantity <= 0:
+            cart.pop(str(cart_id), None)
+        elif str(cart_id) in cart:
+            cart[str(cart_id)] = quantity
+        _save_guest_cart(cart)
+        return jsonify({'success': True, **_guest_cart_summary(get_db(), cart)})
+    
+    if quantity <= 0:
+        summary = _cart_write('DELETE FROM cart WHERE id = ? AND user_id = ?',
+                              (cart_id, session['user_id']), session['user_id'])
+    else:
+        summary = _cart_write('UPDATE cart SET quantity = ? WHERE id = ? AND user_id = ?',
+                              (quantity, cart_id, session['user_id']), session['user_id'])
+    
+    return jsonify({'success': True, **summary})
+
+# Toplu sepet/favori işlemleri: op -> (sorgu, istek öğesinden parametre üreten fonksiyon)
+CART_BATCH_OPERATIONS = {
+    'add': ('''
+        INSERT INTO cart (user_id, product_id, quantity) VALUES (?, ?, ?)
+        ON CONFLICT(user_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+    ''', lambda op, user_id: (user_id, int(op['product_id']), int(op.get('quantity', 1)))),
+    'update': ('UPDATE cart SET quantity = ? WHERE id = ? AND user_id = ?',
+               lambda op, user_id: (int(op['quantity']), int(op['cart_id']), user_id)),
+    'remove': ('DELETE FROM cart WHERE id = ? AND user_id = ?',
+               lambda op, user_id: (int(op['cart_id']), user_id)),
+    'favorite': ('INSERT OR IGNORE INTO favorites (user_id, product_id) VALUES (?, ?)',
+                 lambda op, user_id: (user_id, int(op['product_id']))),
+    'unfavorite': ('DELETE FROM favorites WHERE user_id = ? AND product_id = ?',
+                   lambda op, user_id: (user_id, int(op['product_id']))),
+}
+
+# İşlem listesini sıralı (sorgu, parametre listesi) gruplarına çevir
+# Aynı türden ardışık işlemler tek executemany'de birleşir; geçersiz öğede ValueError.
+def _group_cart_operations(operations, user_id):
+    groups = []
+    for op in operations:
+        try:
+            kind = op.get('op')
+            if kind == 'update' and int(op['quantity']) <= 0:
+                kind = 'remove'
+            # Tekli ve misafir ekleme yollarıyla aynı: miktar pozitif olmalı
+            if kind == 'add' and int(op.get('quantity', 1)) <= 0:
+                raise ValueError
+            sql, make_params = CART_BATCH_OPERATIONS[kind]
+            params = make_params(op, user_id)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError(f'Geçersiz işlem: {op!r}')
+        if groups and groups[-1][0] == sql:
+            groups[-1][1].append(params)
+        else:
+            groups.append((sql, [params]))
+    return groups
+
+# Sepetin güncel hali: özet, satırlar ve favori ürün id'leri
+def _cart_state(conn, user_id):
+    items = conn.execute('''
+        SELECT c.id AS cart_id, c.product_id, c.quantity, p.price
+        FROM cart c
+        JOIN products p ON c.product_id = p.id
+        WHERE c.user_id = ?
+        ORDER BY c.id
+    ''', (user_id,)).fetchall()
+    favorites = conn.execute('SELECT product_id FROM favorites WHERE user_id = ? ORDER BY product_id',
+                             (user_id,)).fetchall()
+    return {
+        'cart_count': len(items),
+        'quantity': sum(item['quantity'] for item in items),
+        'total': sum(item['price'] * item['quantity'] for item in items),
+        'items': [dict(item) for item in items],
+        'favorites': [row['product_id'] for row in favorites],
+    }
+
+# Birden fazla sepet/favori işlemini tek istekte ve tek transaction'da uygula
+# {"operations": [{"op": "add", "product_id": 3, "quantity": 2}, {"op": "remove", "cart_id": 7}, ...]}
+@app.route('/api/cart/batch', methods=['POST'])
+@login_required
+def cart_batch():
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'message': 'İşlem listesi gerekli'}), 400
+    if len(operations) > app.config['CART_BATCH_MAX_OPERATIONS']:
+        return jsonify({'success': False, 'message': 'Çok fazla işlem'}), 400
+    
+    user_id = session['user_id']
+    try:
+        groups = _group_cart_operations(operations, user_id)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    def run(conn):
+        for sql, params in groups:
+            conn.executemany(sql, params)
+        return _cart_state(conn, user_id)
+    
+    state = db.write(run)
+    invalidate_favorites(user_id)
+    for op in operations:
+        if op['op'] in ('add', 'favorite'):
+            popularity.record(int(op['product_id']), 'cart' if op['op'] == 'add' else 'favorite')
+    return jsonify({'success': True, **state})
+
+@app.route('/favorites')
+@login_required
+def favorites():
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT p.*, f.id as favorite_id
+        FROM favorites f
+        JOIN products p ON f.product_id = p.id
+        WHERE f.user_id = ?
+        ORDER BY f.created_at DESC
+    ''', (session['user_id'],))
+    favorite_products = cursor.fetchall()
+    
+    return render_template('favorites.html', favorite_products=favorite_products)
+
+# ==================== ADMIN PANEL ====================
+
+@app.route('/admin/login', methods=['GET', 'POST'])
+def admin_login():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        if username == 'admin' and password == 'admin':
+            conn = get_db()
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM users WHERE username = ?', ('admin',))
+            user = cursor.fetchone()
+            
+            if user:
+                session['user_id'] = user['id']
+                session['username'] = user['username']
+                session['is_admin'] = 1
+                cache_user(user)
+                flash('Admin paneline hoş geldiniz!', 'success')
+                return redirect(url_for('admin_dashboard'))
+        
+        flash('Kullanıcı adı veya şifre hatalı!', 'error')
+        return redirect(url_for('admin_login'))
+    
+    return render_template('admin_login.html')
+
+@app.route('/admin/dashboard')
+@admin_required
+def admin_dashboard():
+    sort = request.args.get('sort', 'newest')
+    if sort not in PRODUCT_SORTS:
+        sort = 'newest'
+    categories = get_categories()
+    category_names = {cat['id']: cat['name'] for cat in categories}
+    # ?job=<id> - ürün eklemeden sonra görsel işleme işinin durumu
+    job_id = request.args.get('job', type=int)
+    job = jobs.get_job(job_id) if job_id else None
+    
+    # ?stream=1 - tüm liste, satırlar hazır oldukça gönderilir
+    if request.args.get('stream') == '1':
+        return stream_template('admin_dashboard.html', products=iter_products(sort),
+                               categories=categories, category_names=category_names,
+                               sort=sort, sorts=PRODUCT_SORT_LABELS, next_cursor=None,
+                               is_first_page=True, streaming=True, job=job)
+    
+    products, next_cursor = fetch_product_page(sort=sort, after=request.args.get('after'),
+                                               limit=app.config['ADMIN_PRODUCTS_PER_PAGE'])
+    
+    return render_template('admin_dashboard.html', products=products, categories=categories,
+                           category_names=category_names, sort=sort, sorts=PRODUCT_SORT_LABELS,
+                           next_cursor=next_cursor, is_first_page=not request.args.get('after'),
+                           streaming=False, job=job)
+
+@app.route('/admin/api/cache-stats')
+@admin_required
+def admin_cache_stats():
+    return jsonify({
+        'db_pool': db.get_pool().stats(),
+        'categories': category_cache.stats(),
+        'users': user_cache.stats(),
+        'pages': page_cache.stats(),
+        'products': product_cache.stats(),
+        'product_store': product_store.stats() if product_store is not None else None,
+        'favorites': favorites_cache.stats(),
+        'password_hash': passwords.get_service().stats(),
+        'popularity': popularity.get_counter().stats(),
+    })
+
+# Prometheus metin formatında istek ve sorgu ölçümleri (süreç başına)
+@app.route('/admin/metrics')
+@admin_required
+def admin_metrics():
+    registry = metrics.get_registry(app)
+    if registry is None:
+        return 'metrics disabled\n', 404, {'Content-Type': 'text/plain; charset=utf-8'}
+    return registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/admin/add-product', methods=['GET', 'POST'])
+@admin_required
+def admin_add_product():
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        price = request.form.get('price', '').strip()
+        description = request.form.get('description', '').strip()
+        category_id = request.form.get('category_id', '').strip()
+        file = request.files.get('image')
+        
+        if not name or not price or not category_id:
+            flash('Lütfen zorunlu alanları doldurun!', 'error')
+            return redirect(url_for('admin_add_product'))
+        
+        try:
+            price = float(price)
+        except ValueError:
+            flash('Geçerli bir fiyat girin!', 'error')
+            return redirect(url_for('admin_add_product'))
+        
+        # Görseli sadece staging alanına yaz; işleme arka planda yapılır
+        staged = None
+        if file and file.filename and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            # secure_filename ASCII olmayan adları noktasıyla siler (фото.jpg -> jpg); uzantı orijinal addan alınır
+            extension = file.filename.rsplit('.', 1)[1].lower()
+            staged = f"{uuid.uuid4().hex}_{filename}"
+            file.save(os.path.join(app.config['UPLOAD_STAGING_FOLDER'], staged))
+        
+        # Veritabanına kaydet
+        product_id = db.execute_write('''
+            INSERT INTO products (name, price, description, category_id)
+            VALUES (?, ?, ?, ?)
+        ''', (name, price, description, category_id)).lastrowid
+        catalog_version.invalidate()
+        
+        if staged:
+            job_id = jobs.enqueue('process_upload', {'product_id': product_id, 'staged': staged,
+                                                     'filename': filename, 'extension': extension})
+            flash(f'Ürün başarıyla eklendi! Görsel arka planda işleniyor (iş #{job_id}).', 'success')
+            # Panel işin durumunu gösterir (/admin/api/jobs/<id>)
+            return redirect(url_for('admin_dashboard', job=job_id))
+        else:
+            flash('Ürün başarıyla eklendi!', 'success')
+        return redirect(url_for('admin_dashboard'))
+    
+    # GET request - formu göster
+    categories = get_categories()
+    
+    return render_template('admin_add_product.html', categories=categories)
+
+@app.route('/admin/delete-product/<int:product_id>', methods=['POST'])
+@admin_required
+def admin_delete_product(product_id):
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    # Ürün bilgisini al (görsel dosyasını silmek için)
+    cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
+    product = cursor.fetchone()
+    
+    if not product:
+        flash('Ürün bulunamadı!', 'error')
+        return redirect(url_for('admin_dashboard'))
+    
+    # İlgili yorumları, sepet ve favori kayıtlarını ve ürünü tek transaction'da sil
+    db.execute_writes([
+        ('DELETE FROM comments WHERE product_id = ?', (product_id,)),
+        ('DELETE FROM cart WHERE product_id = ?', (product_id,)),
+        ('DELETE FROM favorites WHERE product_id = ?', (product_id,)),
+        ('DELETE FROM related_products WHERE product_id = ?', (product_id,)),
+        ('DELETE FROM product_stats WHERE product_id = ?', (product_id,)),
+        ('DELETE FROM products WHERE id = ?', (product_id,)),
+    ])
+    invalidate_product(product_id)
+    
+    # Görsel dosyası başka ürün kullanmıyorsa (ref_count = 0) arka planda silinir
+    if product['image']:
+        jobs.enqueue('cleanup_image', {'image': product['image']})
+    
+    flash('Ürün başarıyla silindi!', 'success')
+    return redirect(url_for('admin_dashboard'))
+
+# ==================== BACKGROUND JOBS ====================
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Staging'deki yüklemeyi içerik adresli yerine taşı, ürüne bağla, varyantları üret
+# Aynı içerik daha önce yüklendiyse mevcut dosya ve varyantlar yeniden kullanılır.
+@jobs.handler('process_upload')
+def process_upload_job(payload):
+    staged_path = os.path.join(app.config['UPLOAD_STAGING_FOLDER'], payload['staged'])
+    if not os.path.exists(staged_path):
+        raise FileNotFoundError(staged_path)
+    checksum = _file_checksum(staged_path)
+    # Eski kuyruk kayıtlarında 'extension' yok
+    extension = payload.get('extension') or payload['filename'].rsplit('.', 1)[-1]
+    image = images.content_path(checksum, extension)
+
+    # Taşıma yazma transaction'ı içinde yapılır; aynı dosyayı silen temizlik işiyle yarışmaz
+    def attach(conn):
+        existing = conn.execute('SELECT path, width, height, variants FROM image_files WHERE checksum = ?',
+                                (checksum,)).fetchone()
+        if existing is None:
+            conn.execute('INSERT INTO image_files (path, checksum) VALUES (?, ?)', (image, checksum))
+            row = (image, None, None, None)
+        else:
+            row = tuple(existing)
+        updated = conn.execute('''
+            UPDATE products SET image = ?, image_width = ?, image_height = ?, image_variants = ?
+            WHERE id = ?
+        ''', (*row, payload['product_id'])).rowcount
+        if existing is None:
+            target = os.path.join(app.config['UPLOAD_FOLDER'], image)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(staged_path, target)
+        else:
+            os.remove(staged_path)
+        return existing is not None, row[0], updated
+
+    deduplicated, image, updated = db.write(attach)
+    invalidate_product(payload['product_id'])
+
+    # Ürün bu arada silindiyse dosya sahipsiz kalmasın
+    if not updated:
+        jobs.enqueue('cleanup_image', {'image': image})
+    elif not deduplicated:
+        processed = images.process_image(app.config['UPLOAD_FOLDER'], image, app.config['IMAGE_FORMATS'])
+        if processed:
+            width, height, variants = processed
+            _store_image_info(image, width, height, images.dump_variants(variants))
+    return {'image': image, 'checksum': checksum, 'deduplicated': deduplicated}
+
+# Görsel boyut/varyant bilgisini dosya kaydına ve onu kullanan tüm ürünlere yaz
+def _store_image_info(image, width, height, variants):
+    db.execute_writes([
+        ('UPDATE image_files SET width = ?, height = ?, variants = ? WHERE path = ?', (width, height, variants, image)),
+        ('UPDATE products SET image_width = ?, image_height = ?, image_variants = ? WHERE image = ?',
+         (width, height, variants, image)),
+    ])
+    catalog_version.invalidate()
+
+# Referansı kalmamış (ref_count = 0) görseli ve varyantlarını sil
+# Silme yazma transaction'ı içinde yapılır; aynı içeriği yeniden yükleyen işle yarışmaz.
+@jobs.handler('cleanup_image')
+def cleanup_image_job(payload):
+    def remove(conn):
+        row = conn.execute('DELETE FROM image_files WHERE path = ? AND ref_count <= 0 RETURNING path, variants',
+                           (payload['image'],)).fetchone()
+        if row is None:
+            return False
+        image_path = os.path.join(app.config['UPLOAD_FOLDER'], row['path'])
+        if os.path.exists(image_path):
+            os.remove(image_path)
+        images.remove_variants(app.config['UPLOAD_FOLDER'], row['path'], images.load_variants(row['variants']))
+        return True
+    return {'removed': db.write(remove)}
+
+@app.route('/admin/api/jobs/<int:job_id>')
+@admin_required
+def admin_job_status(job_id):
+    job = jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'İş bulunamadı'}), 404
+    return jsonify({'success': True, 'job': job})
+
+# ==================== CLI ====================
+
+# Eski adlı görselleri içerik adresli yapıya taşı ve varyantları (yeniden) üret: flask --app app rebuild-images
+@app.cli.command('rebuild-images')
+def rebuild_images_command():
+    conn = db.connect(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'])
+    rows = conn.execute('SELECT path, variants FROM image_files').fetchall()
+    done = moved = 0
+    for row in rows:
+        image = row['path']
+        source = os.path.join(app.config['UPLOAD_FOLDER'], image)
+        if not os.path.exists(source):
+            continue
+        checksum = _file_checksum(source)
+        target = images.content_path(checksum, image.rsplit('.', 1)[-1])
+        if image != target:
+            conn.execute('BEGIN IMMEDIATE')
+            existing = conn.execute('SELECT path FROM image_files WHERE checksum = ? AND path != ?',
+                                    (checksum, image)).fetchone()
+            if existing:
+                target = existing['path']
+            else:
+                conn.execute('UPDATE image_files SET checksum = NULL WHERE path = ?', (image,))
+                conn.execute('INSERT INTO image_files (path, checksum) VALUES (?, ?)', (target, checksum))
+            # Referans sayıları tetikleyicilerle yeni kayda geçer
+            conn.execute('UPDATE products SET image = ? WHERE image = ?', (target, image))
+            conn.execute('DELETE FROM image_files WHERE path = ?', (image,))
+            if existing:
+                os.remove(source)
+            else:
+                os.makedirs(os.path.dirname(os.path.join(app.config['UPLOAD_FOLDER'], target)), exist_ok=True)
+                os.replace(source, os.path.join(app.config['UPLOAD_FOLDER'], target))
+            conn.commit()
+            images.remove_variants(app.config['UPLOAD_FOLDER'], image, images.load_variants(row['variants']))
+            image = target
+            moved += 1
+        
+        if _process_image_file(conn, image):
+            done += 1
+    conn.close()
+    print(f"{done}/{len(rows)} görsel işlendi, {moved} görsel içerik adresli yapıya taşındı.")
+
+# Varyantları üret, boyut/varyant bilgisini dosya kaydına ve onu kullanan ürünlere yaz (CLI bağlantısıyla)
+def _process_image_file(conn, image):
+    processed = images.process_image(app.config['UPLOAD_FOLDER'], image, app.config['IMAGE_FORMATS'])
+    if not processed:
+        return False
+    width, height, variants = processed
+    variants = images.dump_variants(variants)
+    conn.execute('UPDATE image_files SET width = ?, height = ?, variants = ? WHERE path = ?',
+                 (width, height, variants, image))
+    conn.execute('UPDATE products SET image_width = ?, image_height = ?, image_variants = ? WHERE image = ?',
+                 (width, height, variants, image))
+    conn.commit()
+    return True
+
+# Toplu katalog içe/dışa aktarma: flask --app app catalog import|export
+catalog_cli = AppGroup('catalog', help='Toplu katalog içe/dışa aktarma (CSV/JSONL)')
+
+# Yerel görseli içerik adresli yere kopyala (transaction dışında; hash ve kopyalama en pahalı adım)
+def _copy_import_image(source):
+    checksum = _file_checksum(source)
+    image = images.content_path(checksum, source.rsplit('.', 1)[-1])
+    target = os.path.join(app.config['UPLOAD_FOLDER'], image)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target + '.tmp')
+        os.replace(target + '.tmp', target)
+    return image, checksum
+
+# Görsel kaydını bul veya oluştur; (path, width, height, variants) döner
+# Aynı içerik başka uzantıyla kayıtlıysa mevcut kayıt kullanılır, kopya silinir.
+def _register_import_image(conn, source, image, checksum):
+    existing = conn.execute('SELECT path, width, height, variants FROM image_files WHERE checksum = ?',
+                            (checksum,)).fetchone()
+    if existing is not None:
+        if existing['path'] != image:
+            os.remove(os.path.join(app.config['UPLOAD_FOLDER'], image))
+        return tuple(existing)
+    conn.execute('INSERT INTO image_files (path, checksum) VALUES (?, ?)', (image, checksum))
+    # Kopyalama ile transaction arasında temizlik işi aynı dosyayı silmiş olabilir
+    target = os.path.join(app.config['UPLOAD_FOLDER'], image)
+    if not os.path.exists(target):
+        shutil.copyfile(source, target)
+    return image, None, None, None
+
+@catalog_cli.command('import')
+@click.argument('source')
+@click.option('--format', 'fmt', type=click.Choice(catalog.FORMATS), help='Varsayılan: uzantıdan (.jsonl ya da .csv)')
+@click.option('--images-dir', default='.', show_default=True, help='Göreli görsel yollarının kök klasörü')
+@click.option('--batch-size', default=5000, show_default=True, help='Transaction başına satır')
+@click.option('--create-categories', is_flag=True, help='Bilinmeyen kategori adlarını oluştur')
+@click.option('--skip-variants', is_flag=True, help='Varyantları üretme (sonra: flask rebuild-images)')
+def catalog_import_command(source, fmt, images_dir, batch_size, create_categories, skip_variants):
+    """SOURCE (CSV/JSONL, '-' stdin) dosyasındaki ürünleri ekle.
+
+    Sütunlar: name, price, description, category (ad veya id), image (yerel yol).
+    """
+    fmt = catalog.detect_format(source, fmt)
+    conn = db.connect(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'])
+    categories = {}
+    for row in conn.execute('SELECT id, name FROM categories'):
+        categories[str(row['id'])] = row['id']
+        categories[row['name'].casefold()] = row['id']
+
+    def resolve_category(value):
+        category_id = categories.get(value) or categories.get(value.casefold())
+        if category_id is None and create_categories and not value.isdigit():
+            conn.execute('BEGIN IMMEDIATE')
+            category_id = conn.execute('INSERT INTO categories (name) VALUES (?) RETURNING id', (value,)).fetchone()[0]
+            conn.commit()
+            categories[value.casefold()] = category_id
+            click.echo(f"Kategori oluşturuldu: {value} (#{category_id})", err=True)
+        return category_id
+
+    # Okuma -> ayrıştırma -> görsel kopyalama zinciri; hatalı satırlar atlanır ve raporlanır
+    errors = 0
+    def parsed(rows):
+        nonlocal errors
+        for number, row in rows:
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                name, price, description, category_id, image = catalog.parse_product(row, resolve_category)
+                copied = None
+                if image:
+                    image = os.path.join(images_dir, image)
+                    if not allowed_file(image) or not os.path.isfile(image):
+                        raise ValueError(f'görsel bulunamadı veya desteklenmiyor: {image}')
+                    copied = _copy_import_image(image)
+            except (ValueError, OSError) as e:
+                errors += 1
+                if errors <= 20:
+                    click.echo(f"Satır {number}: {e}", err=True)
+                continue
+            yield name, price, description, category_id, image, copied
+
+    progress = catalog.Progress('İçe aktarma')
+    with catalog.open_file(source, 'r') as f:
+        for batch in catalog.batched(parsed(catalog.read_rows(f, fmt)), batch_size):
+            conn.execute('BEGIN IMMEDIATE')
+            rows = []
+            for name, price, description, category_id, image, copied in batch:
+                info = _register_import_image(conn, image, *copied) if copied else (None, None, None, None)
+                rows.append((name, price, description, category_id, *info))
+            conn.executemany('''
+                INSERT INTO products (name, price, description, category_id, image, image_width, image_height, image_variants)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+            progress.add(len(rows))
+
+    click.echo(f"{progress.count} ürün eklendi, {errors} satır atlandı ({progress.rate():.0f} satır/sn).")
+    if not skip_variants:
+        processed = _process_pending_images(conn)
+        click.echo(f"{processed} yeni görselin varyantları üretildi.")
+    conn.close()
+
+# Boyut/varyant bilgisi olmayan görselleri işle (sayfalı; tablo okunurken güncellenir)
+def _process_pending_images(conn):
+    processed = 0
+    last = ''
+    while True:
+        paths = [row['path'] for row in conn.execute(
+            'SELECT path FROM image_files WHERE width IS NULL AND path > ? ORDER BY path LIMIT 100', (last,))]
+        if not paths:
+            return processed
+        for image in paths:
+            if _process_image_file(conn, image):
+                processed += 1
+        last = paths[-1]
+
+@catalog_cli.command('export')
+@click.argument('table', type=click.Choice(list(catalog.EXPORTS)))
+@click.option('--output', '-o', default='-', show_default=True, help="Hedef dosya ('-' stdout)")
+@click.option('--format', 'fmt', type=click.Choice(catalog.FORMATS), help='Varsayılan: uzantıdan (.jsonl ya da .csv)')
+def catalog_export_command(table, output, fmt):
+    """TABLE (products, comments, favorites) tablosunu CSV/JSONL olarak yaz."""
+    fmt = catalog.detect_format(output, fmt)
+    sql, fields = catalog.EXPORTS[table]
+    conn = db.connect(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'])
+    progress = catalog.Progress('Dışa aktarma')
+    f = catalog.open_file(output, 'w')
+    try:
+        catalog.write_rows(f, fmt, fields, progress.counted(catalog.stream_query(conn, sql)))
+    finally:
+        if f is not sys.stdout:
+            f.close()
+        conn.close()
+    click.echo(f"{progress.count} satır yazıldı ({progress.rate():.0f} satır/sn).", err=True)
+
+app.cli.add_command(catalog_cli)
+
+# Favori/sepet birlikteliğinden ilgili ürün tablosunu yeniden hesapla: flask --app app rebuild-related
+# Çevrimdışı iştir; cron veya systemd timer ile periyodik çalıştırılır.
+@app.cli.command('rebuild-related')
+@click.option('--top-k', type=int, help='Ürün başına komşu (varsayılan RELATED_PRODUCTS_K)')
+@click.option('--backend', type=click.Choice(['numpy', 'python']), help='Varsayılan: NumPy/SciPy kuruluysa numpy')
+def rebuild_related_command(top_k, backend):
+    missing = related.missing_numpy_packages()
+    if backend == 'numpy' and missing:
+        raise click.UsageError(f"--backend numpy için eksik paket: {', '.join(missing)} (pip install numpy scipy)")
+    if backend is None and missing:
+        click.echo(f"{', '.join(missing)} kurulu değil, python yolu kullanılıyor.", err=True)
+    conn = db.connect(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'])
+    rows, stats = related.build(conn, top_k or app.config['RELATED_PRODUCTS_K'], backend)
+    related.store(conn, rows)
+    conn.close()
+    print(f"{stats['products']} ürün için {stats['rows']} komşu yazıldı "
+          f"({stats['users']} kullanıcı, {stats['interactions']} etkileşim, {stats['backend']}, {stats['seconds']} sn).")
+
+# CSS/JS dosyalarını küçült, hash'li adlarla ve .gz/.br kopyalarıyla derle: flask --app app build-assets
+@app.cli.command('build-assets')
+def build_assets_command():
+    manifest, stats = assets.build(app.static_folder, app.config['ASSET_FILES'])
+    app.extensions['assets'] = manifest
+    for name, target, sizes in stats:
+        compressed = ', '.join(f"{encoding} {size / 1024:.1f} KB" for encoding, size in sizes.items()
+                               if encoding not in ('source', 'minified'))
+        print(f"{name} -> {target}: {sizes['source'] / 1024:.1f} KB -> {sizes['minified'] / 1024:.1f} KB ({compressed})")
+
+# Migration'ları ve başlangıç verisini uygula: flask --app app init-db
+# Uygulama preload edilmeden çalıştırılıyorsa deploy sırasında worker'lardan önce bir kez çağrılmalı.
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+    print(f"Veritabanı hazır: {app.config['DATABASE']}")
+
+# Bekleyen arka plan işlerini bu süreçte çalıştır: flask --app app run-jobs
+@app.cli.command('run-jobs')
+def run_jobs_command():
+    print(f"{jobs.run_pending(app)} iş çalıştırıldı.")
+
+# Geliştirme sunucusu; üretim için wsgi.py ve gunicorn.conf.py kullanılır
+if __name__ == '__main__':
+    # Reloader alt süreci (WERKZEUG_RUN_MAIN) migration'ları tekrar çalıştırmaz
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        init_db()
+    app.run(debug=True)
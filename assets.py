@@ -0,0 +1,306 @@
+"""
+Statik dosya derleme
+CSS/JS dosyalarını küçültür, içerik hash'li adlarla static/build/ altına yazar
+ve yanlarına .gz/.br sıkıştırılmış kopyalarını koyar. manifest.json kaynak adı
+hash'li ada eşler; template'ler asset_url() ile hash'li adı kullanır. Hash'li
+dosyalar değişmediği için bir yıl "immutable" önbelleklenir ve tarayıcının
+Accept-Encoding başlığına göre önceden sıkıştırılmış kopya gönderilir.
+brotli paketi kurulu değilse yalnızca .gz üretilir.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli opsiyonel
+    brotli = None
+
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.json'
+# Accept-Encoding -> dosya uzantısı (tercih sırasıyla)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 31536000  # 1 yıl
+# build() çıktısı: <ad>.<12 haneli içerik hash'i><uzantı>
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+
+# ==================== KÜÇÜLTME ====================
+
+# Yorumları atar, boşlukları daraltır; string içerikleri olduğu gibi korunur
+def minify_css(text):
+    out = []
+    space = False
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '/' and text.startswith('*', i + 1):
+            end = text.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            space = True
+            continue
+        if c.isspace():
+            space = True
+            i += 1
+            continue
+        if c in '"\'':
+            end = _string_end(text, i)
+            token = text[i:end]
+            i = end
+        else:
+            token = c
+            i += 1
+        # Seçicilerde ":" öncesi ve "(" öncesi boşluk anlamlıdır (".a :hover", "and (...)")
+        if space and out and out[-1][-1] not in '{};,>:(' and token[0] not in '{};,>)':
+            out.append(' ')
+        space = False
+        if token == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(token)
+    return ''.join(out)
+
+
+# Yorumları atar, girintiyi ve gereksiz boşlukları siler. Satır sonları, otomatik
+# noktalı virgül eklemeyi (ASI) bozmamak için anlam taşıyabilecekleri yerde korunur.
+# String, template literal ve regex literal içerikleri olduğu gibi kopyalanır.
+def minify_js(text):
+    out = []
+    space = newline = False
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '/' and text.startswith('/', i + 1):
+            end = text.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if c == '/' and text.startswith('*', i + 1):
+            end = text.find('*/', i + 2)
+            comment = text[i:n if end == -1 else end + 2]
+            newline = newline or '\n' in comment
+            space = True
+            i += len(comment)
+            continue
+        if c.isspace():
+            newline = newline or c == '\n'
+            space = True
+            i += 1
+            continue
+        prev = out[-1][-1] if out else ''
+        if c in '"\'':
+            end = _string_end(text, i)
+        elif c == '`':
+            end = _template_end(text, i)
+        elif c == '/' and (not prev or prev in '(,=:[!&|?{};+-*%<>~^'):
+            end = _regex_end(text, i)
+        else:
+            end = i + 1
+        token = text[i:end]
+        i = end
+
+        if space and prev:
+            if newline and prev not in '{[(,;=:?&|' and token[0] not in '}]),;.':
+                out.append('\n')
+            elif _is_word(prev) and _is_word(token[0]) or prev + token[0] in ('++', '--', '//'):
+                out.append(' ')
+        space = newline = False
+        out.append(token)
+    return ''.join(out)
+
+
+def _is_word(c):
+    return c.isalnum() or c in '_$\\' or ord(c) > 127
+
+
+def _string_end(text, start):
+    quote = text[start]
+    i = start + 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote:
+            return i + 1
+        i += 1
+    return len(text)
+
+
+# `...${ ifade }...` - ifade içindeki iç içe süslü parantezler sayılır
+def _template_end(text, start):
+    depth = 0
+    i = start + 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if depth == 0 and c == '`':
+            return i + 1
+        if c == '$' and text.startswith('{', i + 1):
+            depth += 1
+            i += 2
+            continue
+        if depth and c == '{':
+            depth += 1
+        elif depth and c == '}':
+            depth -= 1
+        elif depth and c in '"\'`':
+            i = (_template_end if c == '`' else _string_end)(text, i)
+            continue
+        i += 1
+    return len(text)
+
+
+def _regex_end(text, start):
+    in_class = False
+    i = start + 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            break
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            return i + 1
+        i += 1
+    return i
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# ==================== DERLEME ====================
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, BUILD_DIR, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Derleme kimliği: (manifest içeriğinin özeti, manifest'in yazıldığı an UTC) veya ('', None)
+# Sayfa ETag/Last-Modified'ına katılır; yeni derlemeden sonra silinmiş hash'li adları
+# gösteren eski HTML 304 ile tarayıcıda tutulmaz.
+def load_build_info(static_folder):
+    path = os.path.join(static_folder, BUILD_DIR, MANIFEST)
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        built_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    except OSError:
+        return '', None
+    return digest, built_at
+
+
+def build_info(app=None):
+    return (app or current_app).extensions['assets_build']
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+# files: static klasörüne göre kaynak yolları. Yeni manifest'i döndürür.
+# Bir önceki derlemenin dosyaları silinmez; eski HTML'i sunan worker'lar deploy
+# boyunca çalışmaya devam eder. Daha eski derlemeler temizlenir.
+def build(static_folder, files):
+    previous = load_manifest(static_folder)
+    manifest = {}
+    stats = []
+    for name in files:
+        stem, ext = os.path.splitext(name)
+        with open(os.path.join(static_folder, name), encoding='utf-8') as f:
+            source = f.read()
+        minify = MINIFIERS.get(ext.lower())
+        data = (minify(source) if minify else source).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        target = f'{BUILD_DIR}/{stem}.{digest}{ext}'
+        path = os.path.join(static_folder, target)
+
+        _write(path, data)
+        sizes = {'source': len(source.encode('utf-8')), 'minified': len(data)}
+        gz = gzip.compress(data, 9, mtime=0)
+        _write(path + '.gz', gz)
+        sizes['gzip'] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            _write(path + '.br', br)
+            sizes['br'] = len(br)
+        manifest[name] = target
+        stats.append((name, target, sizes))
+
+    _write(os.path.join(static_folder, BUILD_DIR, MANIFEST),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    _remove_stale(static_folder, set(manifest.values()) | set(previous.values()))
+    return manifest, stats
+
+
+def _remove_stale(static_folder, keep):
+    root = os.path.join(static_folder, BUILD_DIR)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            relative = os.path.relpath(os.path.join(directory, filename), static_folder).replace(os.sep, '/')
+            base = relative
+            for _, suffix in ENCODINGS:
+                base = base.removesuffix(suffix)
+            if filename != MANIFEST and base not in keep:
+                os.remove(os.path.join(directory, filename))
+
+
+# ==================== SUNUM ====================
+
+# Hash'li ada URL; derleme yapılmamışsa veya debug modunda kaynak dosyaya düşer
+def asset_url(filename):
+    app = current_app
+    if not app.debug:
+        filename = app.extensions['assets'].get(filename, filename)
+    return url_for('static', filename=filename)
+
+
+def _accepted_encoding(path):
+    accepted = request.accept_encodings
+    for encoding, suffix in ENCODINGS:
+        if accepted[encoding] and os.path.isfile(path + suffix):
+            return encoding, suffix
+    return None, ''
+
+
+# Flask'ın static view'ı yerine: build/ altındaki hash'li dosyalar sıkıştırılmış kopyayla
+# ve immutable önbellek başlıklarıyla, diğerleri (manifest.json dahil) olduğu gibi sunulur
+def static_file(filename):
+    app = current_app
+    if not filename.startswith(BUILD_DIR + '/') or not HASHED_NAME.search(filename):
+        return app.send_static_file(filename)
+
+    encoding, suffix = _accepted_encoding(os.path.join(app.static_folder, filename))
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype,
+                                   max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    app.config.setdefault('ASSET_FILES', ['css/style.css', 'js/main.js'])
+    app.extensions['assets'] = load_manifest(app.static_folder)
+    app.extensions['assets_build'] = load_build_info(app.static_folder)
+    app.view_functions['static'] = static_file
+    app.add_template_global(asset_url)
@@ -0,0 +1,4 @@
+"""
+Litus performans ölçüm araçları
+Çalıştırma: python -m benchmarks.<modül>
+"""
@@ -0,0 +1,146 @@
+"""
+Eşzamanlı okuma/yazma benchmark'ı
+Aynı yük altında eski depolama profilini (rollback journal, kuyruk yok) yeni
+profille (WAL + tek yazıcı kuyruğu) karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.concurrency --seconds 5 --readers 8 --writers 4
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+import app as litus
+import db
+
+PROFILES = {
+    # Değişiklik öncesi davranış: varsayılan journal, her yazma kendi bağlantısında
+    'rollback': {
+        'pragmas': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 1000},
+        'write_queue': False,
+    },
+    'wal': {
+        'pragmas': dict(db.STORAGE_PRAGMAS, busy_timeout=1000),
+        'write_queue': True,
+    },
+}
+
+
+def seed(path, products=2000, users=16):
+    litus.init_db()
+    conn = sqlite3.connect(path)
+    conn.executemany('INSERT INTO products (name, price, description, image, category_id) VALUES (?, ?, ?, ?, ?)',
+                     [(f'Ürün {i}', 100 + i % 50, 'Açıklama ' * 20, None, i % 5 + 1) for i in range(products)])
+    conn.executemany('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     [(f'bench{i}', f'bench{i}@litus.com', 'x') for i in range(users)])
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE username LIKE 'bench%'")]
+    conn.commit()
+    conn.close()
+    return user_ids
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run_profile(name, seconds, readers, writers, products):
+    profile = PROFILES[name]
+    workdir = tempfile.mkdtemp(prefix='litus-bench-')
+    path = os.path.join(workdir, 'bench.db')
+
+    db.shutdown(litus.app)
+    litus.app.config.update(DATABASE=path, SQLITE_PRAGMAS=profile['pragmas'],
+                            DB_WRITE_QUEUE=profile['write_queue'], TESTING=True)
+    user_ids = seed(path, products=products, users=max(writers, 1))
+
+    read_latencies = []
+    write_latencies = []
+    errors = []
+    stop = time.perf_counter() + seconds
+    lock = threading.Lock()
+
+    def reader(n):
+        client = litus.app.test_client()
+        local = []
+        i = n
+        while time.perf_counter() < stop:
+            url = f'/category/{i % 5 + 1}' if i % 2 else f'/product/{i % products + 1}'
+            started = time.perf_counter()
+            try:
+                client.get(url)
+                local.append(time.perf_counter() - started)
+            except sqlite3.OperationalError as e:
+                with lock:
+                    errors.append(str(e))
+            i += 1
+        with lock:
+            read_latencies.extend(local)
+
+    def writer(n):
+        client = litus.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = user_ids[n % len(user_ids)]
+            sess['username'] = f'bench{n}'
+        local = []
+        i = n
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                client.post('/api/add-to-cart', json={'product_id': i % products + 1, 'quantity': 1})
+                local.append(time.perf_counter() - started)
+            except sqlite3.OperationalError as e:
+                with lock:
+                    errors.append(str(e))
+            i += 7
+        with lock:
+            write_latencies.extend(local)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    db.shutdown(litus.app)
+
+    return {
+        'profile': name,
+        'reads': len(read_latencies),
+        'writes': len(write_latencies),
+        'errors': len(errors),
+        'read_rps': len(read_latencies) / seconds,
+        'write_rps': len(write_latencies) / seconds,
+        'read_p50_ms': percentile(read_latencies, 50) * 1000,
+        'read_p95_ms': percentile(read_latencies, 95) * 1000,
+        'read_p99_ms': percentile(read_latencies, 99) * 1000,
+        'write_p50_ms': percentile(write_latencies, 50) * 1000,
+        'write_p95_ms': percentile(write_latencies, 95) * 1000,
+        'read_mean_ms': (statistics.mean(read_latencies) * 1000) if read_latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite eşzamanlı okuma/yazma benchmark')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    for name in args.profiles:
+        r = run_profile(name, args.seconds, args.readers, args.writers, args.products)
+        print(f"{r['profile']:>9}: okuma {r['read_rps']:8.1f}/s "
+              f"p50={r['read_p50_ms']:.1f}ms p95={r['read_p95_ms']:.1f}ms p99={r['read_p99_ms']:.1f}ms | "
+              f"yazma {r['write_rps']:7.1f}/s p95={r['write_p95_ms']:.1f}ms | hata={r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Giriş dalgası altında katalog gecikmesi
+Şifre hash'leme istek thread'inde (inline) ve süreç havuzunda (pool) çalışırken,
+eşzamanlı girişler sürerken katalog isteklerinin p50/p95/p99 gecikmesini ölçer.
+Her mod önce girişsiz, sonra giriş yüküyle çalıştırılır.
+
+Kullanım:
+    python -m benchmarks.logins --seconds 5 --readers 4 --logins 8
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from werkzeug.security import generate_password_hash
+
+import app as litus
+import db
+import migrate_db
+import passwords
+from benchmarks.concurrency import percentile
+
+PASSWORD = 'bench'
+
+
+def seed(path, products, users):
+    conn = db.connect(path, db.STORAGE_PRAGMAS)
+    migrate_db.migrate(conn)
+    conn.executemany('INSERT INTO categories (name) VALUES (?)', [(f'Kategori {i}',) for i in range(5)])
+    conn.executemany('INSERT INTO products (name, price, description, category_id) VALUES (?, ?, ?, ?)',
+                     [(f'Ürün {i}', 100 + i % 50, 'Açıklama ' * 20, i % 5 + 1) for i in range(products)])
+    # Tüm kullanıcılar aynı hash'i paylaşır; parametreler uygulama ayarlarıyla aynı (yeniden hash'leme olmaz)
+    password = generate_password_hash(PASSWORD, method=litus.app.config['PASSWORD_HASH_METHOD'],
+                                      salt_length=litus.app.config['PASSWORD_SALT_LENGTH'])
+    conn.executemany('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     [(f'bench{i}', f'bench{i}@litus.com', password) for i in range(users)])
+    conn.commit()
+    conn.close()
+
+
+def run_phase(seconds, readers, logins, products, users):
+    catalog = []
+    login_results = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def reader(n):
+        client = litus.app.test_client()
+        local = []
+        i = n
+        while time.perf_counter() < stop:
+            url = f'/category/{i % 5 + 1}?sort=price_asc' if i % 2 else f'/product/{i % products + 1}'
+            started = time.perf_counter()
+            client.get(url)
+            local.append(time.perf_counter() - started)
+            i += readers
+        with lock:
+            catalog.extend(local)
+
+    def login(n):
+        local = []
+        i = n
+        while time.perf_counter() < stop:
+            client = litus.app.test_client()
+            started = time.perf_counter()
+            response = client.post('/login', data={'username': f'bench{i % users}', 'password': PASSWORD})
+            local.append((response.status_code, time.perf_counter() - started))
+            if response.status_code == 429:
+                time.sleep(0.05)
+            i += logins
+        with lock:
+            login_results.extend(local)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=login, args=(n,)) for n in range(logins)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    accepted = [elapsed for status, elapsed in login_results if status == 302]
+    return {
+        'catalog_requests': len(catalog),
+        'catalog_p50': percentile(catalog, 50) * 1000,
+        'catalog_p95': percentile(catalog, 95) * 1000,
+        'catalog_p99': percentile(catalog, 99) * 1000,
+        'logins': len(accepted),
+        'login_p95': percentile(accepted, 95) * 1000,
+        'rejected': sum(1 for status, _ in login_results if status == 429),
+    }
+
+
+def run_mode(name, args, path):
+    passwords.shutdown(litus.app)
+    db.shutdown(litus.app)
+    litus.app.config.update(DATABASE=path, TESTING=False, JOB_WORKER_THREADS=0,
+                            PASSWORD_HASH_WORKERS=0 if name == 'inline' else args.hash_workers,
+                            # inline modda sınır yok: eski davranış gibi her giriş hemen hash'lenir
+                            PASSWORD_HASH_MAX_PENDING=args.logins + 1 if name == 'inline' else args.max_pending)
+    # Havuz süreçlerinin açılış maliyeti ölçüme girmesin
+    with litus.app.app_context():
+        passwords.hash_password('warmup')
+
+    idle = run_phase(args.seconds, args.readers, 0, args.products, args.users)
+    busy = run_phase(args.seconds, args.readers, args.logins, args.products, args.users)
+    passwords.shutdown(litus.app)
+    return idle, busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Giriş dalgası altında katalog gecikmesi')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4, help='katalog isteği gönderen thread')
+    parser.add_argument('--logins', type=int, default=8, help='sürekli giriş yapan thread')
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--hash-workers', type=int, default=min(2, os.cpu_count() or 1))
+    parser.add_argument('--max-pending', type=int, default=4)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='litus-logins-'), 'bench.db')
+    seed(path, args.products, args.users)
+    print(f"{os.cpu_count()} çekirdek, {litus.app.config['PASSWORD_HASH_METHOD']}, "
+          f"{args.readers} katalog + {args.logins} giriş thread'i, {args.seconds} sn\n")
+    print(f"{'mod':<8} {'yük':<7} {'katalog':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'giriş':>6} {'giriş p95':>10} {'429':>5}")
+    for name in ('inline', 'pool'):
+        for load, r in zip(('girişsiz', 'girişli'), run_mode(name, args, path)):
+            print(f"{name:<8} {load:<7} {r['catalog_requests']:>8} {r['catalog_p50']:>8.2f} {r['catalog_p95']:>8.2f} "
+                  f"{r['catalog_p99']:>8.2f} {r['logins']:>6} {r['login_p95']:>10.1f} {r['rejected']:>5}")
+    db.shutdown(litus.app)
+
+
+if __name__ == '__main__':
+    main()
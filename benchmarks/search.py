@@ -0,0 +1,101 @@
+"""
+Ürün arama benchmark'ı
+Sentetik bir katalogda FTS5 aramasını LIKE taramasıyla karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.search --products 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import app as litus
+import db
+import migrate_db
+
+WORDS = ['elbise', 'gömlek', 'şapka', 'çanta', 'kolye', 'ipek', 'keten', 'pamuk', 'ışıltılı',
+         'mavi', 'beyaz', 'siyah', 'altın', 'deniz', 'kumsal', 'yazlık', 'örgü', 'süet', 'İnci', 'çizgili']
+SYLLABLES = ['ka', 'le', 'mi', 'şo', 'ru', 'tı', 'na', 'çe', 'bo', 'gü', 'da', 'ye', 'sa', 'lı', 'ko']
+QUERIES = ['elbise', 'elb', 'ipek gömlek', 'isiltili', 'İNCİ', 'çanta', 'kumsal mavi', 'örg', 'sue', 'yazlik']
+
+
+# Gerçekçi seçicilik için ~3000 kelimelik sentetik sözlük (model/koleksiyon adları)
+def vocabulary(rnd):
+    words = set()
+    while len(words) < 3000:
+        words.add(''.join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))))
+    return sorted(words)
+
+
+def seed(path, products):
+    conn = db.connect(path, db.STORAGE_PRAGMAS)
+    migrate_db.migrate(conn)
+    conn.execute("INSERT INTO categories (name) VALUES ('Kadın'), ('Erkek'), ('Çocuk'), ('Aksesuar'), ('Koleksiyon')")
+    rnd = random.Random(42)
+    vocab = vocabulary(rnd)
+    batch = []
+    for i in range(products):
+        name = f'{rnd.choice(vocab)} {rnd.choice(WORDS)}'.title()
+        description = ' '.join(rnd.choices(vocab, k=20) + rnd.choices(WORDS, k=2))
+        batch.append((name, rnd.randint(100, 5000), description, rnd.randint(1, 5)))
+        if len(batch) == 10000:
+            conn.executemany('INSERT INTO products (name, price, description, category_id) VALUES (?, ?, ?, ?)', batch)
+            batch = []
+    if batch:
+        conn.executemany('INSERT INTO products (name, price, description, category_id) VALUES (?, ?, ?, ?)', batch)
+    conn.commit()
+    conn.close()
+
+
+def measure(fn, queries):
+    timings = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)], timings[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FTS5 ve LIKE arama karşılaştırması')
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='litus-search-'), 'search.db')
+    started = time.perf_counter()
+    seed(path, args.products)
+    print(f'{args.products} ürün {time.perf_counter() - started:.1f} sn içinde oluşturuldu')
+
+    db.shutdown(litus.app)
+    litus.app.config['DATABASE'] = path
+    vocab = vocabulary(random.Random(42))
+    rnd = random.Random(7)
+    # Yarısı tek model adı, yarısı model adı + ürün türü
+    queries = [rnd.choice(vocab) if i % 2 else f'{rnd.choice(vocab)} {rnd.choice(QUERIES)}'
+               for i in range(args.queries)]
+
+    with litus.app.test_request_context():
+        conn = db.get_db()
+
+        def fts(q):
+            litus.search_products(q, limit=24)
+
+        def fts_category(q):
+            litus.search_products(q, category_id=3, limit=24)
+
+        def like(q):
+            conn.execute('SELECT * FROM products WHERE name LIKE ? OR description LIKE ? LIMIT 24',
+                         (f'%{q}%', f'%{q}%')).fetchall()
+
+        for label, fn in [('fts5', fts), ('fts5+kategori', fts_category), ('like', like)]:
+            p50, p95, worst = measure(fn, queries)
+            print(f'{label:>14}: p50={p50:.2f}ms p95={p95:.2f}ms max={worst:.2f}ms')
+    db.shutdown(litus.app)
+
+
+if __name__ == '__main__':
+    main()
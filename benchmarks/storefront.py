@@ -0,0 +1,366 @@
+"""
+Mağaza yük testi
+Geçici bir SQLite dosyasına sentetik katalog (ürün, kullanıcı, yorum, sepet ve
+favori satırları) yükler; sanal kullanıcılarla gezinme/arama/sepet/ödeme
+senaryolarını çalıştırır ve route başına p50/p95/p99 gecikme, throughput ve
+istek başına sorgu sayısını raporlar. Sorgu sayısı Server-Timing başlığından okunur.
+
+Kullanım:
+    python -m benchmarks.storefront --requests 3000 --clients 4 --output sonuc.json
+    python -m benchmarks.storefront --mix browse --server wsgi
+    python -m benchmarks.storefront --compare onceki.json --tolerance 20
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+from werkzeug.security import generate_password_hash
+
+import app as litus
+import db
+import migrate_db
+from benchmarks.concurrency import percentile
+
+WORDS = ['elbise', 'gömlek', 'şapka', 'çanta', 'kolye', 'ipek', 'keten', 'pamuk', 'ışıltılı',
+         'mavi', 'beyaz', 'siyah', 'altın', 'deniz', 'kumsal', 'yazlık', 'örgü', 'süet', 'inci', 'çizgili']
+CATEGORIES = ['Kadın', 'Erkek', 'Çocuk', 'Aksesuar', 'Koleksiyon']
+PASSWORD = 'bench'
+
+# Senaryo karışımları: senaryo -> ağırlık
+MIXES = {
+    'browse': {'browse': 1},
+    'search': {'search': 1},
+    'cart': {'cart': 1},
+    'checkout': {'checkout': 1},
+    'all': {'browse': 50, 'search': 20, 'cart': 20, 'checkout': 10},
+}
+# Giriş gerektiren senaryolar (diğerleri anonim çalışır ve sayfa önbelleğine düşebilir)
+LOGGED_IN = {'cart', 'checkout'}
+
+
+def seed(path, products, users, comments, carts, favorites, rnd):
+    conn = db.connect(path, db.STORAGE_PRAGMAS)
+    migrate_db.migrate(conn)
+    conn.executemany('INSERT INTO categories (name) VALUES (?)', [(name,) for name in CATEGORIES])
+    conn.executemany('INSERT INTO products (name, price, description, category_id) VALUES (?, ?, ?, ?)', [
+        (f'{rnd.choice(WORDS)} {rnd.choice(WORDS)} {i}'.title(), rnd.randint(100, 5000),
+         ' '.join(rnd.choices(WORDS, k=15)), rnd.randint(1, len(CATEGORIES)))
+        for i in range(products)
+    ])
+    # Şifre hash'i pahalı; tüm sanal kullanıcılar aynı hash'i paylaşır
+    password = generate_password_hash(PASSWORD)
+    conn.executemany('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     [(f'bench{i}', f'bench{i}@litus.com', password) for i in range(users)])
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE username LIKE 'bench%' ORDER BY id")]
+    authors = list(enumerate(user_ids))
+    rows = []
+    for _ in range(comments):
+        n, user_id = rnd.choice(authors)
+        rows.append((rnd.randint(1, products), user_id, f'bench{n}', ' '.join(rnd.choices(WORDS, k=12))))
+    conn.executemany('INSERT INTO comments (product_id, user_id, username, comment) VALUES (?, ?, ?, ?)', rows)
+    conn.executemany('INSERT OR IGNORE INTO cart (user_id, product_id, quantity) VALUES (?, ?, ?)',
+                     [(rnd.choice(user_ids), rnd.randint(1, products), rnd.randint(1, 3)) for _ in range(carts)])
+    conn.executemany('INSERT OR IGNORE INTO favorites (user_id, product_id) VALUES (?, ?)',
+                     [(rnd.choice(user_ids), rnd.randint(1, products)) for _ in range(favorites)])
+    conn.commit()
+    conn.close()
+    return len(user_ids)
+
+
+# Flask test istemcisi (ağ yok, WSGI uygulaması doğrudan çağrılır)
+class TestClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, form=None):
+        response = self.client.open(path, method=method, json=json_body, data=form)
+        body = response.get_data()
+        return response.status_code, response.headers, body
+
+
+# Yerel WSGI sunucusuna HTTP istemcisi (çerezler korunur, yönlendirme izlenmez)
+class HTTPClient:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies),
+                                                  _NoRedirect)
+
+    def request(self, method, path, json_body=None, form=None):
+        data, headers = None, {}
+        if json_body is not None:
+            data, headers = json.dumps(json_body).encode(), {'Content-Type': 'application/json'}
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode()
+            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(req) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+# Sanal kullanıcı: senaryoları sırayla çalıştırır, her isteği kaydeder
+class VirtualUser:
+    def __init__(self, client, rnd, products, record):
+        self.client = client
+        self.rnd = rnd
+        self.products = products
+        self.record = record
+        self.logged_in = False
+
+    def call(self, method, path, json_body=None, form=None):
+        started = time.perf_counter()
+        status, headers, body = self.client.request(method, path, json_body, form)
+        elapsed = time.perf_counter() - started
+        self.record(method, path, status, elapsed, _query_count(headers))
+        return status, body
+
+    def login(self, username):
+        status, _, _ = self.client.request('POST', '/login', form={'username': username, 'password': PASSWORD})
+        self.logged_in = status == 302
+
+    def product_id(self):
+        # Popüler ürünler daha sık gezilir (önbelleklerin gerçekçi isabet oranı için)
+        return min(int(self.rnd.paretovariate(1.2)), self.products)
+
+    def browse(self):
+        category_id = self.rnd.randint(1, len(CATEGORIES))
+        self.call('GET', '/')
+        self.call('GET', f'/category/{category_id}')
+        self.call('GET', f'/category/{category_id}?sort={self.rnd.choice(list(litus.PRODUCT_SORTS))}')
+        product_id = self.product_id()
+        self.call('GET', f'/product/{product_id}')
+        if self.rnd.random() < 0.3:
+            self.call('GET', f'/api/product/{product_id}/comments?limit=20')
+
+    def search(self):
+        words = self.rnd.sample(WORDS, self.rnd.randint(1, 2))
+        query = urllib.parse.quote(' '.join(words))
+        self.call('GET', f'/search?q={query}')
+        self.call('GET', f'/api/search?q={urllib.parse.quote(words[0][:3])}&limit=10')
+
+    def cart(self):
+        product_id = self.product_id()
+        self.call('GET', f'/product/{product_id}')
+        self.call('POST', '/api/add-to-cart', json_body={'product_id': product_id, 'quantity': 1})
+        self.call('GET', '/api/cart/summary')
+        if self.rnd.random() < 0.3:
+            self.call('POST', '/api/toggle-favorite', json_body={'product_id': product_id})
+
+    # Uygulamada ödeme adımı yok; sepeti görüntüleme, miktar güncelleme ve
+    # sepeti toplu boşaltma (siparişin tamamlanması) ile benzetilir.
+    def checkout(self):
+        self.call('GET', '/cart')
+        ops = [{'op': 'add', 'product_id': self.product_id(), 'quantity': 1} for _ in range(3)]
+        status, body = self.call('POST', '/api/cart/batch', json_body={'operations': ops})
+        items = json.loads(body).get('items', []) if status == 200 else []
+        if items:
+            self.call('POST', '/api/cart/batch', json_body={'operations': [
+                {'op': 'update', 'cart_id': item['cart_id'], 'quantity': self.rnd.randint(1, 3)} for item in items[:2]
+            ]})
+            self.call('POST', '/api/cart/batch', json_body={'operations': [
+                {'op': 'remove', 'cart_id': item['cart_id']} for item in items
+            ]})
+
+
+def _query_count(headers):
+    # werkzeug.Headers ve http.client.HTTPMessage ikisi de get_all destekler
+    for value in headers.get_all('Server-Timing') or ():
+        match = re.search(r'desc="(\d+) queries"', value)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def route_label(method, path):
+    adapter = litus.app.url_map.bind('localhost')
+    try:
+        endpoint, _ = adapter.match(path.split('?', 1)[0], method=method)
+    except Exception:
+        endpoint = 'unknown'
+    return f'{method} {endpoint}'
+
+
+def start_wsgi_server():
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, litus.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='bench-wsgi', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def run(args):
+    rnd = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(prefix='litus-storefront-'), 'bench.db')
+    started = time.perf_counter()
+    users = seed(path, args.products, args.users, args.comments, args.carts, args.favorites, rnd)
+    seed_seconds = time.perf_counter() - started
+    print(f'Katalog {seed_seconds:.1f} sn içinde oluşturuldu: {args.products} ürün, {users} kullanıcı, '
+          f'{args.comments} yorum')
+
+    db.shutdown(litus.app)
+    litus.app.config.update(DATABASE=path, TESTING=False, JOB_WORKER_THREADS=0, N_PLUS_ONE_THRESHOLD=0)
+    for cache in (litus.page_cache, litus.product_cache, litus.user_cache, litus.favorites_cache):
+        cache.clear()
+    litus.category_cache.clear()
+
+    server = None
+    if args.server == 'wsgi':
+        server, base_url = start_wsgi_server()
+
+    samples = []
+    lock = threading.Lock()
+    mix = MIXES[args.mix]
+    scenarios, weights = list(mix), list(mix.values())
+    per_client = args.requests // args.clients
+
+    def client_loop(n):
+        client = HTTPClient(base_url) if server else TestClient(litus.app)
+        local = []
+        user = VirtualUser(client, random.Random(args.seed * 1000 + n), args.products,
+                           lambda method, path, status, elapsed, queries: local.append(
+                               (route_label(method, path), status, elapsed, queries)))
+        if any(name in LOGGED_IN for name in scenarios):
+            user.login(f'bench{n % users}')
+        while len(local) < per_client:
+            scenario = user.rnd.choices(scenarios, weights)[0]
+            getattr(user, scenario)()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client_loop, args=(n,)) for n in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if server:
+        server.shutdown()
+    db.shutdown(litus.app)
+    return summarize(samples, wall, args, seed_seconds)
+
+
+def _latency_summary(latencies, count, wall=None):
+    summary = {
+        'requests': count,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    if wall:
+        summary['throughput_rps'] = round(count / wall, 1)
+    return summary
+
+
+def summarize(samples, wall, args, seed_seconds):
+    routes = {}
+    for label in sorted({sample[0] for sample in samples}):
+        rows = [sample for sample in samples if sample[0] == label]
+        queries = [row[3] for row in rows if row[3] is not None]
+        routes[label] = dict(
+            _latency_summary([row[2] for row in rows], len(rows)),
+            errors=sum(1 for row in rows if row[1] >= 500),
+            queries_per_request=round(sum(queries) / len(queries), 2) if queries else None,
+        )
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'args': vars(args),
+            'seed_seconds': round(seed_seconds, 2),
+            'wall_seconds': round(wall, 3),
+        },
+        'overall': dict(_latency_summary([sample[2] for sample in samples], len(samples), wall),
+                        errors=sum(1 for sample in samples if sample[1] >= 500)),
+        'routes': routes,
+    }
+
+
+def print_report(result):
+    overall = result['overall']
+    print(f"\n{overall['requests']} istek, {overall['throughput_rps']} istek/sn, "
+          f"p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms, hata={overall['errors']}")
+    print(f"{'route':<34} {'adet':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'sorgu':>6}")
+    for label, r in result['routes'].items():
+        queries = '-' if r['queries_per_request'] is None else f"{r['queries_per_request']:.1f}"
+        print(f"{label:<34} {r['requests']:>6} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {queries:>6}")
+
+
+# Önceki bir sonuç dosyasıyla karşılaştır; p95'i tolerance yüzdesinden fazla kötüleşen
+# veya istek başına sorgu sayısı artan route'lar gerileme sayılır
+def compare(result, baseline, tolerance):
+    regressions = []
+    print(f"\nKarşılaştırma ({baseline['meta']['timestamp']}):")
+    for label, r in result['routes'].items():
+        old = baseline['routes'].get(label)
+        if not old:
+            continue
+        change = (r['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0.0
+        # Sorgu sayısı önbellek isabetine göre oynar; yarım sorgudan fazla artış gerileme sayılır
+        more_queries = (r['queries_per_request'] or 0) > (old.get('queries_per_request') or 0) + 0.5
+        flag = ''
+        if change > tolerance or more_queries:
+            flag = '  << GERİLEME'
+            regressions.append(label)
+        print(f"{label:<34} p95 {old['p95_ms']:>8.2f} -> {r['p95_ms']:>8.2f} ms ({change:+.0f}%) "
+              f"sorgu {old.get('queries_per_request')} -> {r['queries_per_request']}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mağaza route yük testi')
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--carts', type=int, default=1000)
+    parser.add_argument('--favorites', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=3000, help='toplam istek sayısı (yaklaşık)')
+    parser.add_argument('--clients', type=int, default=4, help='eşzamanlı sanal kullanıcı')
+    parser.add_argument('--mix', choices=list(MIXES), default='all')
+    parser.add_argument('--server', choices=['client', 'wsgi'], default='client',
+                        help='client: Flask test istemcisi, wsgi: yerel HTTP sunucusu')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--compare', help='karşılaştırılacak önceki JSON sonucu')
+    parser.add_argument('--tolerance', type=float, default=20.0, help='p95 için izin verilen artış (%%)')
+    args = parser.parse_args()
+
+    result = run(args)
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f'\nSonuçlar {args.output} dosyasına yazıldı')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
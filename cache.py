@@ -0,0 +1,246 @@
+"""
+Süreç içi önbellekler
+Değerler cache_versions tablosundaki sürüm damgasıyla doğrulanır; damga
+tetikleyicilerle (trigger) artırıldığı için başka worker süreçlerinin
+yazmaları da en geç bir yoklama aralığı sonra görülür.
+SharedStore, worker süreçlerinin ortak kullandığı disk üstü ikinci katmandır.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def get_version(conn, name):
+    row = conn.execute('SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else 0
+
+
+# Yoklamalı sürüm damgası
+# current() veritabanına en fazla poll_interval saniyede bir gider.
+class VersionStamp:
+    def __init__(self, name, poll_interval=1.0):
+        self.name = name
+        self.poll_interval = poll_interval
+        self._version = None
+        self._next_check = 0.0
+
+    def current(self, conn):
+        now = time.monotonic()
+        if self._version is None or now >= self._next_check:
+            self._version = get_version(conn, self.name)
+            self._next_check = now + self.poll_interval
+        return self._version
+
+    # Bu süreçteki bir yazmadan sonra: bir sonraki current() hemen yoklasın
+    def invalidate(self):
+        self._next_check = 0.0
+
+
+# Sürüm damgalı tek değerlik önbellek
+# loader(conn) değeri üretir; sürüm en fazla poll_interval saniyede bir kontrol edilir.
+class VersionedCache:
+    def __init__(self, name, loader, poll_interval=1.0):
+        self.name = name
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        self._value = None
+        self._version = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, conn):
+        now = time.monotonic()
+        if self._version is not None and now < self._next_check:
+            self.hits += 1
+            return self._value
+        with self._lock:
+            version = get_version(conn, self.name)
+            if version != self._version:
+                self._value = self.loader(conn)
+                self._version = version
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._next_check = now + self.poll_interval
+            return self._value
+
+    # Bir sonraki get() çağrısında sürümü hemen kontrol et
+    def invalidate(self):
+        self._next_check = 0.0
+
+    @property
+    def version(self):
+        return self._version
+
+    def clear(self):
+        with self._lock:
+            self._value = None
+            self._version = None
+            self._next_check = 0.0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'version': self._version}
+
+
+# Boyut sınırlı, süreli (TTL) LRU önbellek
+# ttl=None ise kayıtlar yalnızca LRU ile düşer. maxbytes verilirse sizeof(value)
+# toplamı bu sınırı aşmayacak şekilde en eski kayıtlar atılır.
+class LRUCache:
+    def __init__(self, maxsize=1024, ttl=None, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _size(self, value):
+        return self.sizeof(value) if self.maxbytes else 0
+
+    def _pop(self, key):
+        value, _ = self._data.pop(key)
+        self.bytes -= self._size(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._pop(key)
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        size = self._size(value)
+        if self.maxbytes and size > self.maxbytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (value, expires)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes and self.bytes > self.maxbytes):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'bytes': self.bytes,
+            'maxbytes': self.maxbytes,
+        }
+
+
+# Worker süreçleri arasında paylaşılan, pickle'lanmış değerler tutan SQLite dosyası
+# Sürüm tutmaz; okuyan taraf değeri kendisi doğrulamalıdır. Hatalar önbellek
+# ıskası gibi ele alınır, istek bu yüzden düşmez.
+class SharedStore:
+    def __init__(self, path, maxsize=100000):
+        self.path = path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._writes = 0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # Thread başına bağlantı; fork sonrası yeniden açılır
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=1.0)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_stored_at ON entries(stored_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, default=None):
+        try:
+            row = self._conn().execute('SELECT value FROM entries WHERE key = ?', (str(key),)).fetchone()
+            if row is not None:
+                self.hits += 1
+                return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError) as e:
+            self.errors += 1
+            print(f"Paylaşılan önbellek okuma hatası: {e}")
+        self.misses += 1
+        return default
+
+    def set(self, key, value):
+        try:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO entries (key, value, stored_at) VALUES (?, ?, ?)',
+                         (str(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time()))
+            # Boyut sınırı: her 256 yazmada bir en eski kayıtları at
+            self._writes += 1
+            if self.maxsize and self._writes % 256 == 0:
+                conn.execute('''
+                    DELETE FROM entries WHERE key IN (
+                        SELECT key FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.maxsize,))
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Paylaşılan önbellek yazma hatası: {e}")
+
+    def delete(self, key):
+        try:
+            self._conn().execute('DELETE FROM entries WHERE key = ?', (str(key),))
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Paylaşılan önbellek silme hatası: {e}")
+
+    def clear(self):
+        try:
+            self._conn().execute('DELETE FROM entries')
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Paylaşılan önbellek temizleme hatası: {e}")
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'errors': self.errors}
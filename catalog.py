@@ -0,0 +1,140 @@
+"""
+Toplu katalog içe/dışa aktarma
+CSV veya JSONL satırları generator zinciriyle okunur/yazılır; bellek kullanımı
+dosya boyutundan bağımsızdır. İçe aktarma satırları partiler halinde
+executemany ile tek transaction'da yazar. Komutlar app.py'deki
+"flask --app app catalog" grubundadır.
+"""
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+FORMATS = ('csv', 'jsonl')
+
+# Dışa aktarma: tablo -> (sorgu, sütunlar). Ürün çıktısı içe aktarmaya geri verilebilir.
+EXPORTS = {
+    'products': ('''
+        SELECT p.id, p.name, p.price, p.description, c.name AS category, p.image, p.comment_count, p.updated_at
+        FROM products p
+        LEFT JOIN categories c ON c.id = p.category_id
+        ORDER BY p.id
+    ''', ['id', 'name', 'price', 'description', 'category', 'image', 'comment_count', 'updated_at']),
+    'comments': ('''
+        SELECT id, product_id, user_id, username, comment, created_at
+        FROM comments
+        ORDER BY id
+    ''', ['id', 'product_id', 'user_id', 'username', 'comment', 'created_at']),
+    'favorites': ('''
+        SELECT f.id, f.user_id, u.username, f.product_id, f.created_at
+        FROM favorites f
+        LEFT JOIN users u ON u.id = f.user_id
+        ORDER BY f.id
+    ''', ['id', 'user_id', 'username', 'product_id', 'created_at']),
+}
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'csv'
+
+
+def open_file(path, mode):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    # CSV modülü satır sonlarını kendisi yönetir; BOM'lu (Excel) CSV de okunur
+    return open(path, mode, newline='', encoding='utf-8-sig' if 'r' in mode else 'utf-8')
+
+
+# (satır numarası, sözlük) üretir
+# Ayrıştırılamayan JSONL satırı (satır numarası, ValueError) olarak üretilir; okuma devam eder.
+def read_rows(f, fmt):
+    if fmt == 'jsonl':
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f'geçersiz JSON: {e}')
+                continue
+            if not isinstance(row, dict):
+                yield number, ValueError(f'JSON nesnesi değil: {type(row).__name__}')
+                continue
+            yield number, row
+    else:
+        # 1. satır başlık
+        for number, row in enumerate(csv.DictReader(f), 2):
+            yield number, row
+
+
+def write_rows(f, fmt, fields, rows):
+    if fmt == 'jsonl':
+        for row in rows:
+            f.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n')
+    else:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# Satırı (name, price, description, category_id, image) biçimine çevir; hatalı satırda ValueError
+# resolve_category(ad_veya_id) -> id veya None
+def parse_product(row, resolve_category):
+    name = str(row.get('name') or '').strip()
+    if not name:
+        raise ValueError('name boş')
+    try:
+        price = float(str(row.get('price', '')).replace(',', '.'))
+    except ValueError:
+        raise ValueError(f"geçersiz fiyat: {row.get('price')!r}")
+    category = str(row.get('category') or row.get('category_id') or '').strip()
+    category_id = resolve_category(category) if category else None
+    if category_id is None:
+        raise ValueError(f'bilinmeyen kategori: {category!r}')
+    description = str(row.get('description') or '').strip()
+    image = str(row.get('image') or '').strip() or None
+    return name, price, description, category_id, image
+
+
+# Sorgu sonucunu sabit bellekle satır satır üret
+def stream_query(conn, sql, size=1000):
+    cursor = conn.execute(sql)
+    while rows := cursor.fetchmany(size):
+        yield from (tuple(row) for row in rows)
+
+
+# Satır/sn ilerleme raporu (stderr)
+class Progress:
+    def __init__(self, label, every=5.0):
+        self.label = label
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def add(self, n=1):
+        self.count += n
+        now = time.perf_counter()
+        if now - self._last >= self.every:
+            self._last = now
+            print(f'{self.label}: {self.count} satır, {self.rate():.0f} satır/sn', file=sys.stderr)
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def counted(self, rows):
+        for row in rows:
+            self.add()
+            yield row
@@ -0,0 +1,254 @@
+"""
+Veritabanı bağlantı katmanı
+İstek başına tek bağlantı (flask.g), süreç başına sınırlı bağlantı havuzu
+ve yazma işlemlerini sıraya koyan tek yazıcı kuyruğu
+"""
+import contextvars
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from flask import current_app, g
+
+
+# Varsayılan depolama profili
+# WAL sayesinde okuyucular yazıcıyı, yazıcı da okuyucuları beklemez.
+STORAGE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',     # WAL ile güvenli, her commit'te fsync yok
+    'busy_timeout': 5000,        # ms - kilit varsa hata yerine bekle
+    'cache_size': -16000,        # ~16MB sayfa önbelleği
+    'mmap_size': 134217728,      # 128MB bellek eşlemeli okuma
+    'temp_store': 'MEMORY',
+}
+
+
+# Tek bir SQLite bağlantısı aç ve başlangıç PRAGMA'larını uygula
+# factory: sqlite3.Connection alt sınıfı (ör. metrics.InstrumentedConnection)
+def connect(path, pragmas=None, factory=sqlite3.Connection):
+    conn = sqlite3.connect(path, check_same_thread=False, factory=factory)
+    conn.row_factory = sqlite3.Row
+    for name, value in (pragmas or {}).items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+# Boşta bekleyen bağlantıları tutan sınırlı havuz
+# Bağlantılar thread'ler arasında paylaşılabilir ama aynı anda tek kullanıcıya verilir.
+# fork sonrası (gunicorn worker vb.) üst sürecin bağlantıları kullanılmaz.
+class ConnectionPool:
+    def __init__(self, path, size=8, pragmas=None, factory=sqlite3.Connection):
+        self.path = path
+        self.size = size
+        self.pragmas = dict(pragmas or {})
+        self.factory = factory
+        self.hits = 0
+        self.misses = 0
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._idle = []
+            self._pid = os.getpid()
+            self.hits = 0
+            self.misses = 0
+
+    def acquire(self):
+        with self._lock:
+            self._check_fork()
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+        return connect(self.path, self.pragmas, self.factory)
+
+    def release(self, conn):
+        try:
+            # Yarım kalan transaction havuza geri dönmesin
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'idle': len(self._idle),
+                'size': self.size,
+            }
+
+
+# Tek yazıcı kuyruğu
+# Tüm yazma işlemleri süreç başına tek bir thread ve tek bir bağlantı üzerinden,
+# sırayla ve BEGIN IMMEDIATE transaction içinde çalışır. Böylece aynı süreçteki
+# yazıcılar birbirini "database is locked" hatasına düşürmez.
+# Fonksiyonlar çağıranın contextvars kopyasında çalışır (istek ölçümleri için).
+class WriteQueue:
+    def __init__(self, path, pragmas=None, factory=sqlite3.Connection):
+        self.path = path
+        self.pragmas = dict(pragmas or {})
+        self.factory = factory
+        self.executed = 0
+        self.failed = 0
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,),
+                                                name='sqlite-writer', daemon=True)
+                self._thread.start()
+            return self._queue
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._ensure_started().put((future, contextvars.copy_context(), fn, args, kwargs))
+        return future
+
+    def pending(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _run(self, jobs):
+        conn = connect(self.path, self.pragmas, self.factory)
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                future, context, fn, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    result = context.run(fn, conn, *args, **kwargs)
+                    conn.commit()
+                except BaseException as e:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    self.failed += 1
+                    future.set_exception(e)
+                else:
+                    self.executed += 1
+                    future.set_result(result)
+        finally:
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            thread, jobs = self._thread, self._queue
+            self._thread = None
+            self._queue = None
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            jobs.put(None)
+            thread.join()
+
+
+# Uygulamaya havuzu ve teardown hook'unu bağla
+def init_app(app):
+    app.config.setdefault('DATABASE', 'database.db')
+    app.config.setdefault('DB_POOL_SIZE', 8)
+    app.config.setdefault('SQLITE_PRAGMAS', dict(STORAGE_PRAGMAS))
+    app.config.setdefault('DB_WRITE_QUEUE', True)
+    app.config.setdefault('DB_WRITE_TIMEOUT', 30)
+    app.config.setdefault('DB_CONNECTION_FACTORY', sqlite3.Connection)
+    app.teardown_appcontext(close_db)
+
+
+# Havuzu ve yazıcı thread'ini kapat (test, yeniden yükleme, ayar değişikliği)
+def shutdown(app):
+    pool = app.extensions.pop('db_pool', None)
+    if pool is not None:
+        pool.close_all()
+    writer = app.extensions.pop('db_writer', None)
+    if writer is not None:
+        writer.close()
+
+
+def get_pool(app=None):
+    app = app or current_app
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        pool = ConnectionPool(app.config['DATABASE'],
+                              size=app.config['DB_POOL_SIZE'],
+                              pragmas=app.config['SQLITE_PRAGMAS'],
+                              factory=app.config['DB_CONNECTION_FACTORY'])
+        app.extensions['db_pool'] = pool
+    return pool
+
+
+def get_writer(app=None):
+    app = app or current_app
+    writer = app.extensions.get('db_writer')
+    if writer is None:
+        writer = WriteQueue(app.config['DATABASE'], app.config['SQLITE_PRAGMAS'],
+                            app.config['DB_CONNECTION_FACTORY'])
+        app.extensions['db_writer'] = writer
+    return writer
+
+
+# İstek boyunca aynı bağlantıyı kullan
+def get_db():
+    if 'db' not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+
+# İstek sonunda bağlantıyı havuza iade et
+def close_db(exc=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+# fn(conn, *args) fonksiyonunu tek bir yazma transaction'ı içinde çalıştır ve sonucunu döndür
+# fn kendi içinde commit/rollback yapmamalı.
+def write(fn, *args, **kwargs):
+    if not current_app.config['DB_WRITE_QUEUE']:
+        conn = get_db()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            result = fn(conn, *args, **kwargs)
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        return result
+    future = get_writer().submit(fn, *args, **kwargs)
+    return future.result(timeout=current_app.config['DB_WRITE_TIMEOUT'])
+
+
+# Tek bir yazma sorgusu; cursor döner (lastrowid / rowcount için)
+def execute_write(sql, params=()):
+    return write(lambda conn: conn.execute(sql, params))
+
+
+# Birden fazla yazma sorgusunu tek transaction'da çalıştır
+def execute_writes(statements):
+    def run(conn):
+        for sql, params in statements:
+            conn.execute(sql, params)
+    write(run)
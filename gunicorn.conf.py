@@ -0,0 +1,42 @@
+"""
+gunicorn ayarları
+    gunicorn -c gunicorn.conf.py
+
+SQLite'ta yazmalar dosya kilidiyle sıralanır; worker sayısını çok artırmak yazma
+bekleyişini büyütür. Bu yüzden çekirdek başına bir süreç ve süreç başına birkaç
+thread (gthread) kullanılır: okumalar thread'lerde paralel ilerler, yazmalar
+her süreçte tek yazıcı kuyruğundan geçer.
+
+Yeniden yükleme:
+    kill -HUP <master>    worker'ları sırayla yeniler (preload'da kod değişmez)
+    kill -USR2 <master>   yeni kodla yeni master başlatır; ardından eski master'a
+                          WINCH ve QUIT gönderilir (kesintisiz deploy)
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'wsgi:application'
+bind = os.environ.get('LITUS_BIND', '0.0.0.0:8000')
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('LITUS_THREADS', 4))
+
+# Migration, template derleme ve önbellek ısıtma master'da bir kez yapılır
+preload_app = True
+
+timeout = 30
+graceful_timeout = 30  # SIGTERM/HUP sonrası çalışan isteklerin ve işlerin bitmesi için süre
+keepalive = 5
+# Bellek şişmesine karşı worker'lar ara sıra yenilenir; jitter hepsinin aynı anda yenilenmesini önler
+max_requests = 5000
+max_requests_jitter = 500
+
+accesslog = os.environ.get('LITUS_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+# Worker çıkarken arka plan işlerini bekle ve yazma kuyruğunu boşalt
+def worker_exit(server, worker):
+    import wsgi
+    wsgi.shutdown(wsgi.application, timeout=graceful_timeout)
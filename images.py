@@ -0,0 +1,130 @@
+"""
+Ürün görseli işleme
+Yüklenen görselden farklı genişliklerde WebP/AVIF varyantları üretir ve
+template'lerin srcset/sizes, width/height değerlerini hesaplar.
+Pillow kurulu değilse varyant üretilmez; orijinal görsel kullanılır.
+"""
+import json
+import os
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # pragma: no cover - Pillow opsiyonel
+    Image = None
+
+# Varyant adı -> genişlik (px)
+VARIANT_WIDTHS = {'thumb': 400, 'medium': 800, 'large': 1600}
+
+# Tercih sırasıyla formatlar ve Pillow kayıt ayarları
+FORMAT_OPTIONS = {
+    'avif': {'quality': 55},
+    'webp': {'quality': 80, 'method': 6},
+}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# Ürün ızgaralarında görselin yaklaşık ekran genişliği
+GRID_SIZES = '(max-width: 768px) 50vw, (max-width: 1400px) 33vw, 350px'
+
+
+def available_formats(formats=None):
+    if Image is None:
+        return []
+    formats = formats or list(FORMAT_OPTIONS)
+    return [fmt for fmt in formats if features.check(fmt)]
+
+
+# İçerik adresli dosya adı: ab/cd/<sha256>.<uzantı>
+# Aynı içerik her zaman aynı ada düşer; ad değişmediği için dosya "immutable" sunulabilir.
+def content_path(checksum, ext):
+    return f'{checksum[:2]}/{checksum[2:4]}/{checksum}.{ext.lower().lstrip(".")}'
+
+
+def variant_filename(image, width, fmt):
+    stem = os.path.splitext(image)[0]
+    return f'variants/{stem}_{width}w.{fmt}'
+
+
+# Görseli aç, EXIF yönünü düzelt, varyantları yaz
+# Dönüş: (genişlik, yükseklik, varyant bilgisi dict) veya Pillow yoksa / görsel açılamazsa None
+def process_image(upload_folder, image, formats=None):
+    formats = available_formats(formats)
+    if not formats:
+        return None
+    source_path = os.path.join(upload_folder, image)
+    try:
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if img.mode in ('LA', 'P', 'PA') else 'RGB')
+            width, height = img.size
+
+            widths = sorted({w for w in VARIANT_WIDTHS.values() if w < width} | {min(width, max(VARIANT_WIDTHS.values()))})
+            os.makedirs(os.path.dirname(os.path.join(upload_folder, variant_filename(image, width, formats[0]))),
+                        exist_ok=True)
+            for w in widths:
+                resized = img if w == width else img.resize((w, round(height * w / width)), Image.LANCZOS)
+                for fmt in formats:
+                    resized.save(os.path.join(upload_folder, variant_filename(image, w, fmt)),
+                                 fmt.upper(), **FORMAT_OPTIONS[fmt])
+    except (OSError, ValueError) as e:
+        print(f"Görsel işleme hatası: {e}")
+        return None
+    return width, height, {'widths': widths, 'formats': formats}
+
+
+def remove_variants(upload_folder, image, variants):
+    if not variants:
+        return
+    for w in variants.get('widths', []):
+        for fmt in variants.get('formats', []):
+            path = os.path.join(upload_folder, variant_filename(image, w, fmt))
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Varyant silme hatası: {e}")
+
+
+def load_variants(value):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def dump_variants(variants):
+    return json.dumps(variants, separators=(',', ':')) if variants else None
+
+
+# Template için <picture> verisi
+# url_for: dosya adı -> URL çeviren fonksiyon (static/uploads altı)
+def picture_data(row, url_for, sizes=None, prefer='medium'):
+    keys = row.keys()
+    image = row['image']
+    variants = load_variants(row['image_variants']) if 'image_variants' in keys else None
+    width = row['image_width'] if 'image_width' in keys else None
+    height = row['image_height'] if 'image_height' in keys else None
+
+    if not variants:
+        return {'src': url_for(image), 'sources': [], 'sizes': None, 'width': width, 'height': height}
+
+    widths = variants['widths']
+    target = VARIANT_WIDTHS.get(prefer, VARIANT_WIDTHS['medium'])
+    fallback_width = min((w for w in widths if w >= target), default=widths[-1])
+    sources = [
+        {
+            'type': MIME_TYPES[fmt],
+            'srcset': ', '.join(f'{url_for(variant_filename(image, w, fmt))} {w}w' for w in widths),
+        }
+        for fmt in variants['formats']
+    ]
+    return {
+        'src': url_for(variant_filename(image, fallback_width, variants['formats'][-1])),
+        'sources': sources,
+        'sizes': sizes or GRID_SIZES,
+        'width': width,
+        'height': height,
+    }
@@ -0,0 +1,210 @@
+"""
+Arka plan iş kuyruğu
+İşler SQLite'taki jobs tablosunda tutulur. Süreç başına küçük bir thread havuzu
+bekleyen işleri atomik olarak sahiplenir, çalıştırır ve hata durumunda artan
+beklemeyle yeniden dener. Tablo paylaşıldığı için birden fazla worker süreci
+aynı kuyruğu güvenle işleyebilir.
+"""
+import json
+import os
+import threading
+import time
+import traceback
+
+from flask import current_app
+
+import db
+
+_handlers = {}
+
+
+# İş türü için işleyici kaydet: fn(payload) -> JSON'a çevrilebilir sonuç
+def handler(kind):
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def init_app(app):
+    app.config.setdefault('JOB_WORKER_THREADS', 2)  # 0: işleri enqueue anında senkron çalıştır
+    app.config.setdefault('JOB_POLL_INTERVAL', 2.0)
+    app.config.setdefault('JOB_MAX_ATTEMPTS', 3)
+    app.config.setdefault('JOB_RETRY_DELAY', 2.0)  # sn - her denemede iki katına çıkar
+    app.config.setdefault('JOB_STALE_AFTER', 300)  # sn - bu süreden uzun "running" kalan iş yeniden sıraya girer
+
+    # Worker'ı ilk istekte başlat (fork sonrası her süreç kendi thread'lerini açar)
+    @app.before_request
+    def _start_job_worker():
+        if app.config['JOB_WORKER_THREADS']:
+            get_worker(app).ensure_started()
+
+
+def get_worker(app=None):
+    app = app or current_app._get_current_object()
+    worker = app.extensions.get('job_worker')
+    if worker is None:
+        worker = JobWorker(app)
+        app.extensions['job_worker'] = worker
+    return worker
+
+
+# Worker thread'lerini durdur; o an çalışan işin bitmesi beklenir (süreç kapanışı, yeniden yükleme)
+def shutdown(app, timeout=None):
+    worker = app.extensions.pop('job_worker', None)
+    if worker is not None:
+        worker.stop(timeout)
+
+
+# Yeni iş ekle ve id'sini döndür
+def enqueue(kind, payload, max_attempts=None):
+    app = current_app._get_current_object()
+    job_id = db.execute_write(
+        'INSERT INTO jobs (kind, payload, max_attempts, run_after) VALUES (?, ?, ?, ?)',
+        (kind, json.dumps(payload), max_attempts or app.config['JOB_MAX_ATTEMPTS'], time.time())).lastrowid
+    if app.config['JOB_WORKER_THREADS']:
+        worker = get_worker(app)
+        worker.ensure_started()
+        worker.notify()
+    else:
+        run_pending(app)
+    return job_id
+
+
+def get_job(job_id):
+    row = db.get_db().execute(
+        'SELECT id, kind, status, attempts, max_attempts, last_error, result, created_at, updated_at '
+        'FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+
+def _claim(conn):
+    row = conn.execute('''
+        UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_at = ?,
+                        updated_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM jobs WHERE status = 'pending' AND run_after <= ?
+            ORDER BY id LIMIT 1
+        )
+        RETURNING id, kind, payload, attempts, max_attempts
+    ''', (time.time(), time.time())).fetchone()
+    return dict(row) if row else None
+
+
+def _finish(conn, job_id, result):
+    conn.execute('''
+        UPDATE jobs SET status = 'done', result = ?, last_error = NULL, locked_at = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''', (json.dumps(result), job_id))
+
+
+def _fail(conn, job, error, retry_delay):
+    if job['attempts'] < job['max_attempts']:
+        status, run_after = 'pending', time.time() + retry_delay * 2 ** (job['attempts'] - 1)
+    else:
+        status, run_after = 'failed', None
+    conn.execute('''
+        UPDATE jobs SET status = ?, run_after = COALESCE(?, run_after), last_error = ?, locked_at = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''', (status, run_after, error, job['id']))
+
+
+# Bir işi sahiplenip çalıştır; iş yoksa False döner
+# Önce okuma bağlantısıyla bakılır; boş kuyruk yoklaması yazma kilidi almaz.
+def run_one(app):
+    with app.app_context():
+        pending = db.get_db().execute(
+            "SELECT 1 FROM jobs WHERE status = 'pending' AND run_after <= ? LIMIT 1", (time.time(),)).fetchone()
+        job = db.write(_claim) if pending else None
+    if job is None:
+        return False
+
+    fn = _handlers.get(job['kind'])
+    try:
+        if fn is None:
+            raise LookupError(f"Bilinmeyen iş türü: {job['kind']}")
+        with app.app_context():
+            result = fn(json.loads(job['payload']))
+    except Exception as e:
+        print(f"İş hatası ({job['kind']} #{job['id']}): {e}")
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        with app.app_context():
+            db.write(_fail, job, error, app.config['JOB_RETRY_DELAY'])
+    else:
+        with app.app_context():
+            db.write(_finish, job['id'], result)
+    return True
+
+
+# Şu an çalıştırılabilir tüm işleri bitir (senkron mod ve CLI için)
+def run_pending(app):
+    count = 0
+    while run_one(app):
+        count += 1
+    return count
+
+
+def requeue_stale(app):
+    def requeue(conn):
+        return conn.execute('''
+            UPDATE jobs SET status = 'pending', locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'running' AND locked_at < ?
+        ''', (time.time() - app.config['JOB_STALE_AFTER'],)).rowcount
+    with app.app_context():
+        return db.write(requeue)
+
+
+class JobWorker:
+    def __init__(self, app):
+        self.app = app
+        self.processed = 0
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def ensure_started(self):
+        if self._pid == os.getpid() and self._threads:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._threads:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            requeue_stale(self.app)
+            self._threads = [
+                threading.Thread(target=self._loop, name=f'job-worker-{n}', daemon=True)
+                for n in range(self.app.config['JOB_WORKER_THREADS'])
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def notify(self):
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                worked = run_one(self.app)
+            except Exception as e:
+                print(f"İş kuyruğu hatası: {e}")
+                worked = False
+            if worked:
+                self.processed += 1
+                continue
+            self._wake.wait(self.app.config['JOB_POLL_INTERVAL'])
+            self._wake.clear()
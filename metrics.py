@@ -0,0 +1,213 @@
+"""
+İstek ve SQL ölçümleri
+Her isteğin süresi ve çalıştırdığı SQL sorgularının sayısı/süresi toplanır.
+Sonuçlar Server-Timing başlığı ve Prometheus metin formatı ile sunulur; bir
+istek eşikten fazla sorgu çalıştırırsa (N+1 şüphesi) uyarı loglanır.
+Sayaçlar süreç başınadır; birden fazla worker varsa Prometheus her birini ayrı kazır.
+"""
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from flask import g, request
+
+# Süre histogramı sınırları (sn)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# İstek başına sorgu sayısı histogramı sınırları
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Aktif isteğin sorgu istatistikleri. ContextVar olduğu için db.WriteQueue'nun
+# yazıcı thread'inde çalışan fonksiyonlar da isteğe sayılır.
+_current = ContextVar('query_stats', default=None)
+
+
+class QueryStats:
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, sql, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[sql] += 1
+
+
+def _record(sql, started):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(' '.join(sql.split()), time.perf_counter() - started)
+
+
+# Süre, SQLite'ın execute() içinde harcadığı zamandır (SELECT'lerde ilk satıra kadar)
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record(sql, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record(sql, started)
+
+
+# db.connect(..., factory=InstrumentedConnection) ile açılan bağlantılar ölçülür
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+# Süreç başına metrik kaydı
+class Registry:
+    def __init__(self):
+        self.latency = {}        # (endpoint, method) -> Histogram
+        self.query_counts = {}   # endpoint -> Histogram
+        self.query_seconds = Counter()
+        self.requests = Counter()  # (endpoint, method, status) -> adet
+        self.n_plus_one = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, method, status, seconds, stats):
+        with self._lock:
+            key = (endpoint, method)
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.latency[key].observe(seconds)
+            if endpoint not in self.query_counts:
+                self.query_counts[endpoint] = Histogram(QUERY_COUNT_BUCKETS)
+            self.query_counts[endpoint].observe(stats.count)
+            self.query_seconds[endpoint] += stats.seconds
+            self.requests[(endpoint, method, status)] += 1
+
+    def flag_n_plus_one(self, endpoint):
+        with self._lock:
+            self.n_plus_one[endpoint] += 1
+
+    # Prometheus metin formatı (text/plain; version=0.0.4)
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += ['# HELP litus_requests_total HTTP requests handled.',
+                      '# TYPE litus_requests_total counter']
+            for (endpoint, method, status), value in sorted(self.requests.items()):
+                lines.append(f'litus_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {value}')
+
+            lines += ['# HELP litus_request_duration_seconds Request latency.',
+                      '# TYPE litus_request_duration_seconds histogram']
+            for (endpoint, method), hist in sorted(self.latency.items()):
+                lines += _histogram_lines('litus_request_duration_seconds', hist, endpoint=endpoint, method=method)
+
+            lines += ['# HELP litus_db_queries_per_request SQL queries executed per request.',
+                      '# TYPE litus_db_queries_per_request histogram']
+            for endpoint, hist in sorted(self.query_counts.items()):
+                lines += _histogram_lines('litus_db_queries_per_request', hist, endpoint=endpoint)
+
+            lines += ['# HELP litus_db_query_seconds_total Time spent executing SQL.',
+                      '# TYPE litus_db_query_seconds_total counter']
+            for endpoint, value in sorted(self.query_seconds.items()):
+                lines.append(f'litus_db_query_seconds_total{_labels(endpoint=endpoint)} {value:.6f}')
+
+            lines += ['# HELP litus_n_plus_one_total Requests over the N+1 query threshold.',
+                      '# TYPE litus_n_plus_one_total counter']
+            for endpoint, value in sorted(self.n_plus_one.items()):
+                lines.append(f'litus_n_plus_one_total{_labels(endpoint=endpoint)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(**labels):
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _histogram_lines(name, hist, **labels):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{_labels(**labels, le=bound)} {cumulative}')
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {hist.count}')
+    lines.append(f'{name}_sum{_labels(**labels)} {hist.sum:.6f}')
+    lines.append(f'{name}_count{_labels(**labels)} {hist.count}')
+    return lines
+
+
+def init_app(app):
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('SERVER_TIMING', True)
+    app.config.setdefault('N_PLUS_ONE_THRESHOLD', 20)  # istek başına bundan fazla sorgu uyarı verir
+    if not app.config['METRICS_ENABLED']:
+        return
+    app.config['DB_CONNECTION_FACTORY'] = InstrumentedConnection
+    registry = app.extensions['metrics'] = Registry()
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+        g._metrics_token = _current.set(QueryStats())
+
+    @app.after_request
+    def _observe(response):
+        started = g.pop('_metrics_started', None)
+        stats = _current.get()
+        if started is None or stats is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unknown'
+        registry.observe(endpoint, request.method, response.status_code, elapsed, stats)
+
+        threshold = app.config['N_PLUS_ONE_THRESHOLD']
+        if threshold and stats.count > threshold:
+            registry.flag_n_plus_one(endpoint)
+            sql, repeats = stats.statements.most_common(1)[0]
+            app.logger.warning('N+1 şüphesi: %s %s %d sorgu çalıştırdı (en sık %d kez: %s)',
+                               request.method, request.full_path.rstrip('?'), stats.count, repeats, sql[:200])
+
+        if app.config['SERVER_TIMING']:
+            response.headers.add('Server-Timing',
+                                 f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"')
+            response.headers.add('Server-Timing', f'app;dur={elapsed * 1000:.2f}')
+        return response
+
+    @app.teardown_request
+    def _reset_stats(exc=None):
+        token = g.pop('_metrics_token', None)
+        if token is not None:
+            _current.reset(token)
+
+
+def get_registry(app):
+    return app.extensions.get('metrics')
@@ -1,94 +1,491 @@
-"""
-Veritabanı migration scripti
-Mevcut veritabanına eksik kolonları ekler
-"""
-import sqlite3
-import os
-
-def migrate_database():
-    db_path = 'database.db'
-    
-    if not os.path.exists(db_path):
-        print("Veritabanı bulunamadı. Lütfen önce uygulamayı çalıştırın.")
-        return
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    try:
-        # Comments tablosundaki kolonları kontrol et
-        cursor.execute("PRAGMA table_info(comments)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'user_id' not in columns:
-            print("user_id kolonu ekleniyor...")
-            cursor.execute('ALTER TABLE comments ADD COLUMN user_id INTEGER')
-            conn.commit()
-            print("✓ user_id kolonu eklendi!")
-        else:
-            print("✓ user_id kolonu zaten mevcut.")
-        
-        # Users tablosunu kontrol et
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        if not cursor.fetchone():
-            print("Users tablosu oluşturuluyor...")
-            cursor.execute('''
-                CREATE TABLE users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    is_admin INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.commit()
-            print("✓ Users tablosu oluşturuldu!")
-        
-        # Cart tablosunu kontrol et
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cart'")
-        if not cursor.fetchone():
-            print("Cart tablosu oluşturuluyor...")
-            cursor.execute('''
-                CREATE TABLE cart (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    product_id INTEGER NOT NULL,
-                    quantity INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id),
-                    FOREIGN KEY (product_id) REFERENCES products(id)
-                )
-            ''')
-            conn.commit()
-            print("✓ Cart tablosu oluşturuldu!")
-        
-        # Favorites tablosunu kontrol et
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='favorites'")
-        if not cursor.fetchone():
-            print("Favorites tablosu oluşturuluyor...")
-            cursor.execute('''
-                CREATE TABLE favorites (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    product_id INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id),
-                    FOREIGN KEY (product_id) REFERENCES products(id),
-                    UNIQUE(user_id, product_id)
-                )
-            ''')
-            conn.commit()
-            print("✓ Favorites tablosu oluşturuldu!")
-        
-        print("\n✓ Migration tamamlandı!")
-        
-    except Exception as e:
-        print(f"Migration hatası: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-if __name__ == '__main__':
-    migrate_database()
-
+"""
+Veritabanı migration motoru
+Şema değişiklikleri sıralı ve numaralı migration'lar olarak tutulur;
+uygulanan son sürüm schema_version tablosuna kaydedilir.
+
+Kullanım:
+    python migrate_db.py [veritabanı_yolu]
+"""
+import os
+import sqlite3
+import sys
+
+
+# 1 - Temel tablolar (eski init_db / migrate_db içeriği)
+def _create_base_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            description TEXT,
+            image TEXT,
+            category_id INTEGER,
+            FOREIGN KEY (category_id) REFERENCES categories(id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id INTEGER NOT NULL,
+            user_id INTEGER,
+            username TEXT NOT NULL,
+            comment TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES products(id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            is_admin INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cart (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            product_id INTEGER NOT NULL,
+            quantity INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS favorites (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            product_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (product_id) REFERENCES products(id),
+            UNIQUE(user_id, product_id)
+        )
+    ''')
+
+    # Eski veritabanlarında comments.user_id kolonu olmayabilir
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(comments)")]
+    if 'user_id' not in columns:
+        conn.execute('ALTER TABLE comments ADD COLUMN user_id INTEGER')
+
+
+# 2 - İkincil indeksler
+def _add_indexes(conn):
+    # Aynı ürün için birden fazla sepet satırı varsa tek satırda birleştir
+    conn.execute('''
+        UPDATE cart SET quantity = (
+            SELECT SUM(c2.quantity) FROM cart c2
+            WHERE c2.user_id = cart.user_id AND c2.product_id = cart.product_id
+        )
+        WHERE id IN (SELECT MIN(id) FROM cart GROUP BY user_id, product_id HAVING COUNT(*) > 1)
+    ''')
+    conn.execute('DELETE FROM cart WHERE id NOT IN (SELECT MIN(id) FROM cart GROUP BY user_id, product_id)')
+
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_cart_user_product ON cart(user_id, product_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_cart_product ON cart(product_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_favorites_product ON favorites(product_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_product_created ON comments(product_id, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_user ON comments(user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id)')
+
+
+# 3 - Önbellek sürüm damgaları
+# Kategoriler her değiştiğinde tetikleyici sürümü artırır; worker'lar bu satırı yoklar.
+def _add_cache_versions(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('categories', 1)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_categories_{event.lower()}_version
+            AFTER {event} ON categories
+            BEGIN
+                UPDATE cache_versions SET version = version + 1 WHERE name = 'categories';
+            END
+        ''')
+
+
+# 4 - Fiyata göre sıralı sayfalama indeksleri
+def _add_price_indexes(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_category_price ON products(category_id, price)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_price ON products(price)')
+
+
+# 5 - FTS5 ürün arama indeksi
+# Metin 'ı' -> 'i' katlanarak saklanır; geri kalan büyük/küçük harf ve aksan
+# katlamasını (İ, ş, ğ, ç, ö, ü) unicode61 tokenizer yapar. FTS5 derlenmemişse
+# indeks atlanır ve arama LIKE sorgusuna düşer.
+def _add_product_search(conn):
+    if not conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0]:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            conn.execute("DROP TABLE temp.fts5_probe")
+        except sqlite3.OperationalError:
+            return
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+            name, description,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    ''')
+    folded = "replace(COALESCE({0}.name, ''), 'ı', 'i'), replace(COALESCE({0}.description, ''), 'ı', 'i')"
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON products
+        BEGIN
+            INSERT INTO products_fts (rowid, name, description) VALUES (new.id, {folded.format('new')});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE OF name, description ON products
+        BEGIN
+            DELETE FROM products_fts WHERE rowid = old.id;
+            INSERT INTO products_fts (rowid, name, description) VALUES (new.id, {folded.format('new')});
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON products
+        BEGIN
+            DELETE FROM products_fts WHERE rowid = old.id;
+        END
+    ''')
+    conn.execute('DELETE FROM products_fts')
+    conn.execute(f'INSERT INTO products_fts (rowid, name, description) SELECT id, {folded.format("products")} FROM products')
+
+
+# 6 - Katalog sürüm damgası (anonim sayfa önbelleği)
+# Ürün, kategori veya yorum değiştiğinde katalog sayfalarının önbelleği geçersiz olur.
+def _add_catalog_version(conn):
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('catalog', 1)")
+    for table in ('products', 'categories', 'comments'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_catalog_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE cache_versions SET version = version + 1 WHERE name = 'catalog';
+                END
+            ''')
+
+
+# 7 - Koşullu GET için değişiklik damgaları
+# products.updated_at: ürün veya yorumları değiştiğinde (ms hassasiyetinde) güncellenir.
+# category_stamps: kategorideki ürün kartlarını etkileyen her değişiklikte artar.
+NOW_MS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+def _add_change_stamps(conn):
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(products)")]
+    if 'updated_at' not in columns:
+        conn.execute('ALTER TABLE products ADD COLUMN updated_at TEXT')
+    conn.execute(f'UPDATE products SET updated_at = {NOW_MS} WHERE updated_at IS NULL')
+    
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_stamp_insert AFTER INSERT ON products
+        BEGIN
+            UPDATE products SET updated_at = {NOW_MS} WHERE id = new.id;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_stamp_update
+        AFTER UPDATE OF name, price, description, image, category_id ON products
+        BEGIN
+            UPDATE products SET updated_at = {NOW_MS} WHERE id = new.id;
+        END
+    ''')
+    for event, row in (('INSERT', 'new'), ('DELETE', 'old')):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_{event.lower()}_product_stamp AFTER {event} ON comments
+            BEGIN
+                UPDATE products SET updated_at = {NOW_MS} WHERE id = {row}.product_id;
+            END
+        ''')
+    
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS category_stamps (
+            category_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+    ''')
+    bump = (f"INSERT INTO category_stamps (category_id, version, updated_at) VALUES ({{0}}.category_id, 1, {NOW_MS}) "
+            f"ON CONFLICT(category_id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;")
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_category_stamp_insert AFTER INSERT ON products
+        BEGIN
+            {bump.format('new')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_category_stamp_delete AFTER DELETE ON products
+        BEGIN
+            {bump.format('old')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_category_stamp_update
+        AFTER UPDATE OF name, price, image, category_id ON products
+        BEGIN
+            {bump.format('old')}
+            {bump.format('new')}
+        END
+    ''')
+    conn.execute(f'''
+        INSERT OR IGNORE INTO category_stamps (category_id, version, updated_at)
+        SELECT id, 1, {NOW_MS} FROM categories
+    ''')
+
+
+# 8 - Görsel boyutları ve varyantları
+# Varyant bilgisi kart HTML'ini değiştirdiği için damga tetikleyicileri bu kolonları da izler.
+def _add_image_variants(conn):
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(products)")]
+    for column, kind in (('image_width', 'INTEGER'), ('image_height', 'INTEGER'), ('image_variants', 'TEXT')):
+        if column not in columns:
+            conn.execute(f'ALTER TABLE products ADD COLUMN {column} {kind}')
+    
+    watched = 'name, price, description, image, category_id, image_width, image_height, image_variants'
+    conn.execute('DROP TRIGGER IF EXISTS trg_products_stamp_update')
+    conn.execute(f'''
+        CREATE TRIGGER trg_products_stamp_update AFTER UPDATE OF {watched} ON products
+        BEGIN
+            UPDATE products SET updated_at = {NOW_MS} WHERE id = new.id;
+        END
+    ''')
+    bump = (f"INSERT INTO category_stamps (category_id, version, updated_at) VALUES ({{0}}.category_id, 1, {NOW_MS}) "
+            f"ON CONFLICT(category_id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;")
+    conn.execute('DROP TRIGGER IF EXISTS trg_products_category_stamp_update')
+    conn.execute(f'''
+        CREATE TRIGGER trg_products_category_stamp_update AFTER UPDATE OF {watched} ON products
+        BEGIN
+            {bump.format('old')}
+            {bump.format('new')}
+        END
+    ''')
+
+
+# 9 - Arka plan iş kuyruğu ve görsel sağlama toplamı
+def _add_jobs(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after REAL NOT NULL DEFAULT 0,
+            locked_at REAL,
+            last_error TEXT,
+            result TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs(status, run_after)')
+    
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(products)")]
+    if 'image_checksum' not in columns:
+        conn.execute('ALTER TABLE products ADD COLUMN image_checksum TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_image_checksum ON products(image_checksum)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_image ON products(image)')
+
+
+# 10 - İçerik adresli görsel deposu
+# image_files: her fiziksel görsel dosyası için tek satır. ref_count, products.image
+# üzerindeki tetikleyicilerle tutulur; 0'a düşen dosya temizlik işiyle silinebilir.
+# Eski (zaman damgalı) dosyalar checksum'sız olarak kaydedilir.
+def _add_image_files(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS image_files (
+            path TEXT PRIMARY KEY,
+            checksum TEXT UNIQUE,
+            width INTEGER,
+            height INTEGER,
+            variants TEXT,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO image_files (path, checksum, width, height, variants, ref_count)
+        SELECT image, MAX(image_checksum), MAX(image_width), MAX(image_height), MAX(image_variants), COUNT(*)
+        FROM products WHERE image IS NOT NULL
+        GROUP BY image
+    ''')
+    
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_products_image_ref_insert AFTER INSERT ON products
+        WHEN new.image IS NOT NULL
+        BEGIN
+            UPDATE image_files SET ref_count = ref_count + 1 WHERE path = new.image;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_products_image_ref_delete AFTER DELETE ON products
+        WHEN old.image IS NOT NULL
+        BEGIN
+            UPDATE image_files SET ref_count = ref_count - 1 WHERE path = old.image;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_products_image_ref_update AFTER UPDATE OF image ON products
+        WHEN old.image IS NOT new.image
+        BEGIN
+            UPDATE image_files SET ref_count = ref_count - 1 WHERE path = old.image;
+            UPDATE image_files SET ref_count = ref_count + 1 WHERE path = new.image;
+        END
+    ''')
+    
+    # Sağlama toplamı artık image_files'ta
+    conn.execute('DROP INDEX IF EXISTS idx_products_image_checksum')
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(products)")]
+    if 'image_checksum' in columns:
+        conn.execute('ALTER TABLE products DROP COLUMN image_checksum')
+
+
+
+# 11 - Ürün başına yorum sayısı
+# Liste sayfaları yorumları saymadan gösterebilsin diye tetikleyicilerle tutulur.
+# Kart HTML'ini değiştirdiği için kategori damgası tetikleyicisi bu kolonu da izler.
+def _add_comment_count(conn):
+    columns = [column[1] for column in conn.execute("PRAGMA table_info(products)")]
+    if 'comment_count' not in columns:
+        conn.execute('ALTER TABLE products ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0')
+    conn.execute('''
+        UPDATE products SET comment_count = (SELECT COUNT(*) FROM comments WHERE comments.product_id = products.id)
+    ''')
+    
+    for event, row, delta in (('INSERT', 'new', '+ 1'), ('DELETE', 'old', '- 1')):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_{event.lower()}_count AFTER {event} ON comments
+            BEGIN
+                UPDATE products SET comment_count = comment_count {delta} WHERE id = {row}.product_id;
+            END
+        ''')
+    
+    watched = 'name, price, description, image, category_id, image_width, image_height, image_variants, comment_count'
+    bump = (f"INSERT INTO category_stamps (category_id, version, updated_at) VALUES ({{0}}.category_id, 1, {NOW_MS}) "
+            f"ON CONFLICT(category_id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;")
+    conn.execute('DROP TRIGGER IF EXISTS trg_products_category_stamp_update')
+    conn.execute(f'''
+        CREATE TRIGGER trg_products_category_stamp_update AFTER UPDATE OF {watched} ON products
+        BEGIN
+            {bump.format('old')}
+            {bump.format('new')}
+        END
+    ''')
+
+# 12 - İlgili ürünler
+# Çevrimdışı hesaplanan (flask rebuild-related) ürün başına ilk K komşu.
+# Detay sayfası (product_id, rank) birincil anahtarı üzerinden tek aralık okumasıyla alır.
+def _add_related_products(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS related_products (
+            product_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            related_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (product_id, rank)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('related', 1)")
+
+# 13 - Görüntülenme ve trend sayaçları
+# Süreçlerde biriken sayımlar periyodik olarak toplu eklenir (popularity.py).
+# trend = log2(skor) + t / yarı_ömür; ana sayfa sıralamaları indeksten okunur.
+def _add_product_stats(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS product_stats (
+            product_id INTEGER PRIMARY KEY,
+            views INTEGER NOT NULL DEFAULT 0,
+            trend REAL NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_product_stats_trend ON product_stats(trend DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_product_stats_views ON product_stats(views DESC)')
+
+# (sürüm, açıklama, fonksiyon) - yalnızca sona ekleyin, mevcut sürümleri değiştirmeyin
+MIGRATIONS = [
+    (1, 'Temel tablolar', _create_base_tables),
+    (2, 'Sepet, favori, yorum ve ürün indeksleri', _add_indexes),
+    (3, 'Önbellek sürüm damgaları', _add_cache_versions),
+    (4, 'Fiyat sıralama indeksleri', _add_price_indexes),
+    (5, 'FTS5 ürün arama indeksi', _add_product_search),
+    (6, 'Katalog sürüm damgası', _add_catalog_version),
+    (7, 'Ürün ve kategori değişiklik damgaları', _add_change_stamps),
+    (8, 'Görsel boyutları ve varyantları', _add_image_variants),
+    (9, 'Arka plan iş kuyruğu', _add_jobs),
+    (10, 'İçerik adresli görsel deposu', _add_image_files),
+    (11, 'Ürün yorum sayısı', _add_comment_count),
+    (12, 'İlgili ürünler', _add_related_products),
+    (13, 'Görüntülenme ve trend sayaçları', _add_product_stats),
+]
+
+
+def get_schema_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+# Bekleyen migration'ları sırayla uygula, uygulanan sürümleri döndür
+# Her migration kendi transaction'ında çalışır; aynı anda başlayan başka bir
+# süreç BEGIN IMMEDIATE kilidini bekler ve sürümü yeniden okur.
+def migrate(conn):
+    applied = []
+    for version, description, step in MIGRATIONS:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                         (version, description))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+    return applied
+
+
+def migrate_database(db_path='database.db'):
+    if not os.path.exists(db_path):
+        print("Veritabanı bulunamadı. Lütfen önce uygulamayı çalıştırın.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        applied = migrate(conn)
+        for version, description in applied:
+            print(f"✓ {version}: {description}")
+        print(f"\n✓ Migration tamamlandı! Şema sürümü: {get_schema_version(conn)}")
+    except Exception as e:
+        print(f"Migration hatası: {e}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    migrate_database(*sys.argv[1:2])
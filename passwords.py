@@ -0,0 +1,164 @@
+"""
+Şifre hash'leme servisi
+Hash üretme/doğrulama bilerek pahalıdır (scrypt/pbkdf2). Bu işler süreç başına
+küçük bir süreç havuzunda çalışır; giriş dalgası worker thread'lerini ve
+CPU'yu katalog isteklerinin elinden almaz. Aynı anda bekleyebilecek iş sayısı
+sınırlıdır: sınır doluysa kuyruğa eklenmez, Overloaded fırlatılır (429).
+PASSWORD_HASH_TIMEOUT içinde biten iş yoksa da Overloaded fırlatılır.
+Kayıtlı hash'in parametreleri ayarlardan farklıysa başarılı girişte yeni
+parametrelerle yeniden hash'lenir.
+"""
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after=1):
+        super().__init__('Şifre hash kuyruğu dolu')
+        self.retry_after = retry_after
+
+
+# Havuz süreçlerinde çalışan fonksiyonlar (modül seviyesinde olmalı)
+def _hash(password, method, salt_length):
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+# (doğru mu, yeni hash veya None)
+def _verify(pwhash, password, method, salt_length):
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if needs_rehash(pwhash, method, salt_length):
+        return True, generate_password_hash(password, method=method, salt_length=salt_length)
+    return True, None
+
+
+# Ayardaki yöntemin hash'te saklanan tam hali ('scrypt' -> 'scrypt:32768:8:1',
+# 'pbkdf2:sha256' -> 'pbkdf2:sha256:1000000'); süreç başına bir kez hesaplanır
+@functools.lru_cache(maxsize=None)
+def stored_method(method):
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+# "method$salt$hash" biçimindeki hash ayarlardaki parametrelerle üretilmiş mi
+def needs_rehash(pwhash, method, salt_length):
+    parts = pwhash.split('$', 2)
+    return len(parts) != 3 or parts[0] != stored_method(method) or len(parts[1]) != salt_length
+
+
+class HashService:
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._pending = 0
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    # Havuz ilk kullanımda açılır; fork sonrası (gunicorn worker) her süreç kendininkini kurar.
+    # Çok thread'li süreçten fork güvenli olmadığı için havuz forkserver/spawn ile başlatılır.
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            self._pid = os.getpid()
+        return self._executor
+
+    # Yer, iş havuzda gerçekten bitene (veya iptal edilene) kadar tutulur; zaman aşımında
+    # beklemeyi bırakan isteğin işi kuyrukta kalsa bile sınır aşılmaz.
+    def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise Overloaded()
+            self._pending += 1
+            executor = self._get_executor() if self.workers else None
+        if executor is None:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:  # 3.11 öncesinde yerleşik TimeoutError'dan farklı sınıf
+            # Henüz başlamadıysa kuyruktan çıkar (yer hemen boşalır)
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise Overloaded()
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+            }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def init_app(app):
+    app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    app.config.setdefault('PASSWORD_SALT_LENGTH', 16)
+    app.config.setdefault('PASSWORD_HASH_WORKERS', min(2, os.cpu_count() or 1))  # 0: istek thread'inde hash'le
+    app.config.setdefault('PASSWORD_HASH_MAX_PENDING', 16)  # süreç başına aynı anda bekleyebilecek iş
+    app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)
+
+
+def get_service(app=None):
+    app = app or current_app
+    service = app.extensions.get('password_hash')
+    if service is None:
+        service = HashService(app.config['PASSWORD_HASH_WORKERS'],
+                              app.config['PASSWORD_HASH_MAX_PENDING'],
+                              app.config['PASSWORD_HASH_TIMEOUT'])
+        app.extensions['password_hash'] = service
+    return service
+
+
+def shutdown(app):
+    service = app.extensions.pop('password_hash', None)
+    if service is not None:
+        service.close()
+
+
+def hash_password(password):
+    config = current_app.config
+    return get_service().run(_hash, password, config['PASSWORD_HASH_METHOD'], config['PASSWORD_SALT_LENGTH'])
+
+
+# (doğru mu, yeni hash veya None) - yeni hash varsa çağıran kaydetmelidir
+def verify_password(pwhash, password):
+    config = current_app.config
+    return get_service().run(_verify, pwhash, password, config['PASSWORD_HASH_METHOD'],
+                             config['PASSWORD_SALT_LENGTH'])
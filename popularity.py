@@ -0,0 +1,187 @@
+"""
+Görüntülenme ve popülerlik sayaçları
+Ürün görüntülenmeleri ve sepet/favori eklemeleri her istekte veritabanına
+yazılmaz; süreç başına bellekte toplanır ve arka plan thread'i birikenleri
+POPULARITY_FLUSH_INTERVAL saniyede bir tek transaction'da product_stats
+tablosuna ekler. Süreç çökerse son aralıktaki sayımlar kaybolur.
+
+Trend skoru yarı ömrü POPULARITY_HALF_LIFE olan üstel azalmayla tutulur.
+Tabloda skorun kendisi değil log2(skor) + t / yarı_ömür saklanır: bu değer
+zamanla değişmez, sıralaması her an güncel skorun sıralamasıyla aynıdır.
+Böylece eski satırlar hiç yeniden yazılmaz ve ana sayfa indeksli tek bir
+ORDER BY ile okur.
+"""
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+
+import db
+
+# Olay -> trend skoruna katkısı
+EVENT_WEIGHTS = {
+    'view': 1.0,
+    'cart': 3.0,
+    'favorite': 5.0,
+}
+
+
+def init_app(app):
+    app.config.setdefault('POPULARITY_FLUSH_INTERVAL', 10.0)  # sn - 0: her olayı hemen yaz
+    app.config.setdefault('POPULARITY_HALF_LIFE', 12 * 3600)  # sn - trend skoru bu sürede yarıya iner
+
+
+def get_counter(app=None):
+    app = app or current_app._get_current_object()
+    counter = app.extensions.get('popularity')
+    if counter is None:
+        counter = Counter(app)
+        app.extensions['popularity'] = counter
+    return counter
+
+
+# Flush thread'ini durdur ve birikenleri yaz (süreç kapanışı; db.shutdown'dan önce çağrılmalı)
+def shutdown(app, timeout=None):
+    counter = app.extensions.pop('popularity', None)
+    if counter is not None:
+        counter.stop(timeout)
+
+
+# product_id istek verisinden gelebilir; geçersizse sayılmaz (hatalı satır tüm flush'ı bozmasın)
+def record(product_id, event='view'):
+    try:
+        product_id = int(product_id)
+    except (TypeError, ValueError):
+        return
+    get_counter().add(product_id, event)
+
+
+# Eski satırları azaltmadan sıralanabilen trend anahtarı (bkz. modül açıklaması)
+def trend_key(score, now, half_life):
+    return math.log2(score) + now / half_life
+
+
+def current_score(key, now, half_life):
+    return 2.0 ** (key - now / half_life)
+
+
+# pending: {product_id: [görüntülenme, ağırlık]}
+def _flush(conn, pending, now, half_life):
+    ids = list(pending)
+    keys = {}
+    # SQLite parametre sınırı için parça parça
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        keys.update(conn.execute(
+            f"SELECT product_id, trend FROM product_stats WHERE product_id IN ({', '.join('?' * len(chunk))})",
+            chunk).fetchall())
+    rows = []
+    for product_id, (views, weight) in pending.items():
+        score = weight
+        if product_id in keys:
+            score += current_score(keys[product_id], now, half_life)
+        rows.append((product_id, views, trend_key(score, now, half_life)))
+    conn.executemany('''
+        INSERT INTO product_stats (product_id, views, trend) VALUES (?, ?, ?)
+        ON CONFLICT(product_id) DO UPDATE SET views = views + excluded.views, trend = excluded.trend,
+                                              updated_at = CURRENT_TIMESTAMP
+    ''', rows)
+    return len(rows)
+
+
+class Counter:
+    def __init__(self, app):
+        self.app = app
+        self.events = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+        self._pending = defaultdict(lambda: [0, 0.0])
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def add(self, product_id, event='view'):
+        with self._lock:
+            entry = self._pending[product_id]
+            if event == 'view':
+                entry[0] += 1
+            entry[1] += EVENT_WEIGHTS[event]
+            self.events += 1
+        if self.app.config['POPULARITY_FLUSH_INTERVAL']:
+            self._ensure_started()
+        else:
+            self.flush()
+
+    # Fork sonrası (gunicorn worker) her süreç kendi thread'ini açar; devralınan sayımlar atılır
+    def _ensure_started(self):
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            if self._pid is not None:
+                self._pending.clear()
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='popularity-flush', daemon=True)
+            self._thread.start()
+
+    # Birikenleri yaz; yazma başarısız olursa sayımlar bir sonraki flush'a geri eklenir
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: [0, 0.0])
+        if not pending:
+            return 0
+        try:
+            with self.app.app_context():
+                rows = db.write(_flush, dict(pending), time.time(), self.app.config['POPULARITY_HALF_LIFE'])
+        except Exception:
+            with self._lock:
+                self.failures += 1
+                for product_id, (views, weight) in pending.items():
+                    entry = self._pending[product_id]
+                    entry[0] += views
+                    entry[1] += weight
+            raise
+        with self._lock:
+            self.flushes += 1
+            self.flushed_rows += rows
+        return rows
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        self._thread = None
+        if self._pid in (None, os.getpid()):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Popülerlik sayaçları yazılamadı: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'events': self.events,
+                'flushes': self.flushes,
+                'flushed_rows': self.flushed_rows,
+                'failures': self.failures,
+            }
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.app.config['POPULARITY_FLUSH_INTERVAL'])
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Popülerlik sayaçları yazılamadı: {e}")
@@ -0,0 +1,141 @@
+"""
+İlgili ürün hesaplama
+Aynı kullanıcının favorilerinde veya sepetinde birlikte bulunan ürünlerden
+ürün-ürün kosinüs benzerliği hesaplanır; her ürün için en benzer K ürün
+related_products tablosuna yazılır. NumPy/SciPy kuruluysa seyrek matris
+çarpımıyla, değilse saf Python ile ikili sayımla çalışır; sonuç aynıdır.
+Çalıştırma: flask --app app rebuild-related (cron vb. ile periyodik)
+"""
+import heapq
+import math
+import time
+from collections import defaultdict
+
+# NumPy ve SciPy opsiyonel; numpy yolu ikisini birden gerektirir
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover
+    sparse = None
+
+# Sinyal -> (kullanıcı, ürün) sorgusu ve ağırlığı
+SIGNALS = {
+    'favorites': ('SELECT user_id, product_id FROM favorites', 1.0),
+    'cart': ('SELECT user_id, product_id FROM cart', 1.0),
+}
+
+# Bundan fazla ürünle etkileşen kullanıcılar (bot, toplu işlem) sayılmaz;
+# çift sayısı ürün sayısının karesiyle büyüdüğü için hesabı da sınırlar.
+MAX_ITEMS_PER_USER = 500
+
+# Skorlar bu hassasiyete yuvarlanır; iki hesaplama yolunun kayan nokta
+# farkları eşit skorlu komşuların sırasını değiştirmesin
+SCORE_DIGITS = 6
+
+
+# kullanıcı -> {ürün: ağırlık}
+def load_interactions(conn):
+    users = defaultdict(dict)
+    for sql, weight in SIGNALS.values():
+        for user_id, product_id in conn.execute(sql):
+            items = users[user_id]
+            items[product_id] = items.get(product_id, 0.0) + weight
+    return {user_id: items for user_id, items in users.items() if len(items) <= MAX_ITEMS_PER_USER}
+
+
+# ürün -> [(skor, komşu)], skora göre azalan (eşitlikte küçük id önce)
+def _top_k_python(users, k):
+    norms = defaultdict(float)
+    dots = defaultdict(lambda: defaultdict(float))
+    for items in users.values():
+        pairs = sorted(items.items())
+        for i, (a, wa) in enumerate(pairs):
+            norms[a] += wa * wa
+            for b, wb in pairs[i + 1:]:
+                dots[a][b] += wa * wb
+                dots[b][a] += wa * wb
+
+    neighbors = {}
+    for a, row in dots.items():
+        scored = ((round(dot / math.sqrt(norms[a] * norms[b]), SCORE_DIGITS), b) for b, dot in row.items())
+        neighbors[a] = heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1]))
+    return neighbors
+
+
+def _top_k_numpy(users, k):
+    user_ids, item_ids, weights = [], [], []
+    for n, items in enumerate(users.values()):
+        for product_id, weight in items.items():
+            user_ids.append(n)
+            item_ids.append(product_id)
+            weights.append(weight)
+    products, columns = np.unique(np.array(item_ids), return_inverse=True)
+    matrix = sparse.csr_matrix((weights, (user_ids, columns)), shape=(len(users), len(products)))
+
+    # Ürün x ürün iç çarpımları; köşegen ürün normlarının karesi
+    dots = (matrix.T @ matrix).tocsr()
+    inverse_norms = sparse.diags(1.0 / np.sqrt(dots.diagonal()))
+    similarity = (inverse_norms @ dots @ inverse_norms).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    neighbors = {}
+    for row in range(len(products)):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        scores = np.round(similarity.data[start:end], SCORE_DIGITS)
+        related = products[similarity.indices[start:end]]
+        if len(scores) > k:
+            # argpartition K. sıradaki eşitlikleri keyfi keser; sınırdaki eşit skorların hepsi alınır
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores >= threshold
+            scores, related = scores[keep], related[keep]
+        order = np.lexsort((related, -scores))[:k]
+        neighbors[int(products[row])] = [(float(scores[i]), int(related[i])) for i in order]
+    return neighbors
+
+
+# numpy yolu için eksik paketler (boşsa kullanılabilir)
+def missing_numpy_packages():
+    return [name for name, module in (('numpy', np), ('scipy', sparse)) if module is None]
+
+
+# (product_id, rank, related_id, score) satırları ve istatistikler
+# backend verilmezse numpy yolu kullanılabiliyorsa o seçilir; istatistiklerde kullanılan yol döner.
+def build(conn, k=10, backend=None):
+    started = time.perf_counter()
+    missing = missing_numpy_packages()
+    if backend == 'numpy' and missing:
+        raise ValueError(f"numpy yolu için eksik paket: {', '.join(missing)}")
+    backend = backend or ('python' if missing else 'numpy')
+    users = load_interactions(conn)
+    neighbors = (_top_k_numpy if backend == 'numpy' else _top_k_python)(users, k) if users else {}
+    rows = [(product_id, rank, related_id, score)
+            for product_id, items in sorted(neighbors.items())
+            for rank, (score, related_id) in enumerate(items, 1)]
+    return rows, {
+        'backend': backend,
+        'users': len(users),
+        'interactions': sum(len(items) for items in users.values()),
+        'products': len(neighbors),
+        'rows': len(rows),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+# Tabloyu tek transaction'da yenile; 'related' ve 'catalog' damgaları artar (ETag'ler ve sayfa önbelleği yenilenir)
+def store(conn, rows):
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute('DELETE FROM related_products')
+        conn.executemany('INSERT INTO related_products (product_id, rank, related_id, score) VALUES (?, ?, ?, ?)',
+                         rows)
+        conn.execute("UPDATE cache_versions SET version = version + 1 WHERE name IN ('related', 'catalog')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,76 @@
+"""
+Üretim giriş noktası
+create_app() migration'ları bir kez uygular, template'leri derler ve önbellekleri
+ısıtır; ardından fork öncesi açık bağlantı ve thread bırakmaz. gunicorn
+preload_app ile bu işler master süreçte bir kez yapılır, worker'lar hazır
+uygulamayı fork ile devralır.
+
+Kullanım:
+    gunicorn -c gunicorn.conf.py            (Linux/macOS, çok süreçli)
+    python wsgi.py                          (waitress, tek süreç çok thread'li)
+"""
+import os
+
+import db
+import jobs
+import passwords
+import popularity
+
+
+# config: app.py'deki varsayılanların üzerine yazılacak ayarlar. Uygulama modül
+# seviyesinde kurulduğu için içe aktarmada ayarlardan üretilen önbellekler ve
+# sürüm damgaları yeni ayarlarla yeniden kurulur; diğer ayarlar istek anında okunur.
+# Ortam değişkenleri:
+#   LITUS_SKIP_INIT_DB=1  migration'lar deploy adımında ayrıca çalıştırılıyorsa (flask --app app init-db)
+def create_app(config=None):
+    from app import app, configure_caches, init_db
+    if config:
+        app.config.update(config)
+        configure_caches()
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        os.makedirs(app.config['UPLOAD_STAGING_FOLDER'], exist_ok=True)
+
+    if os.environ.get('LITUS_SKIP_INIT_DB') != '1':
+        init_db()
+    warm_up(app)
+
+    # Fork sonrası her worker kendi bağlantılarını ve thread'lerini açar
+    jobs.shutdown(app)
+    passwords.shutdown(app)
+    popularity.shutdown(app)
+    db.shutdown(app)
+    return app
+
+
+# Template'leri derle ve süreçler arası paylaşılabilecek önbellekleri doldur
+def warm_up(app):
+    for name in app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        app.jinja_env.get_template(name)
+    with app.app_context():
+        import app as litus
+        litus.get_categories()
+        litus.catalog_version.current(db.get_db())
+
+
+# Worker kapanırken yarım iş ve yazma bırakma: iş thread'lerini bekle, hash havuzunu kapat,
+# biriken sayaçları yaz, yazma kuyruğunu boşalt
+def shutdown(app, timeout=None):
+    jobs.shutdown(app, timeout)
+    passwords.shutdown(app)
+    popularity.shutdown(app, timeout)
+    db.shutdown(app)
+
+
+application = create_app()
+
+
+if __name__ == '__main__':
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("waitress kurulu değil: pip install waitress (Linux/macOS'ta gunicorn -c gunicorn.conf.py)")
+    threads = int(os.environ.get('LITUS_THREADS', (os.cpu_count() or 1) * 4))
+    try:
+        serve(application, listen=os.environ.get('LITUS_BIND', '0.0.0.0:8000'), threads=threads)
+    finally:
+        shutdown(application)